@@ -0,0 +1,99 @@
+import math
+
+# Numba is optional. Without it the numeric core runs as plain Python with
+# identical results, just without the compiled fast path for parameter sweeps.
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+_DEG_TO_RAD = 0.017453292519943295    # math.radians factor, pi/180
+
+# Hoek-Brown exponentials for integral GSI (0-100). GSI is RQD - 15 clamped
+# to 20-85, so integral RQD inputs - the usual case - hit these tables and
+# give exactly the values math.exp would.
+_EXP_S_LUT = tuple(math.exp((gsi-100)/9) for gsi in range(101))
+_EXP_A_LUT = tuple(math.exp(-gsi/15) for gsi in range(101))
+_EXP_A_MIN = math.exp(-20/3)
+
+# Mathews orientation (B) and gravity (C) factors for integral dips 0-180
+# degrees, the usual input; fractional dips are evaluated directly
+_ORIENT_B_LUT = tuple(max(0.3, min(0.7, 0.3 + (dip-20)/70)) for dip in range(181))
+_GRAVITY_C_LUT = tuple(1 - math.cos(dip * _DEG_TO_RAD) for dip in range(181))
+
+# ============================================================================
+# NUMERIC CORE OF THE STOPE DESIGN
+# ============================================================================
+# These mirror the scalar formulae in stability_analysis but take only floats,
+# so Numba can compile them. fastmath is deliberately left off: reassociating
+# the arithmetic would change rounded design values between the two paths.
+# Compiled kernels release the GIL, so threaded sweeps run them in parallel.
+
+@njit(cache=True, nogil=True)
+def _stability_number_core(q_value, dip, depth):
+    """Mathews stability number N' = Q * A * B * C"""
+    a = 1.0 if depth > 500 else 0.85
+    if dip == math.floor(dip) and 0 <= dip <= 180:
+        b = _ORIENT_B_LUT[int(dip)]
+        c = _GRAVITY_C_LUT[int(dip)]
+    else:
+        b = max(0.3, min(0.7, 0.3 + (dip-20)/70))
+        c = 1 - math.cos(dip * _DEG_TO_RAD)
+    return q_value * a * b * c
+
+@njit(cache=True, nogil=True)
+def _dimension_core(q_value, dip, depth):
+    """RMR, stability number N' and design hydraulic radius from Q"""
+    rmr = max(0, min(100, 9 * math.log10(q_value) + 44))
+    n_prime = _stability_number_core(q_value, dip, depth)
+
+    if n_prime <= 3:
+        hr_design = 2.5 + 0.5*n_prime
+    elif n_prime <= 10:
+        hr_design = 4.0 + 0.8*n_prime
+    else:
+        hr_design = 7.0 + 5.0*math.log10(n_prime)
+    return rmr, n_prime, hr_design
+
+@njit(cache=True, nogil=True)
+def _hoek_brown_core(rqd):
+    """Hoek-Brown unconfined rock mass strength with D = 0"""
+    sigma_ci = 20 + 0.8*rqd
+    gsi = max(20, min(85, rqd-15))
+    if gsi == math.floor(gsi):
+        s = _EXP_S_LUT[int(gsi)]
+        exp_a = _EXP_A_LUT[int(gsi)]
+    else:
+        s = math.exp((gsi-100)/9)
+        exp_a = math.exp(-gsi/15)
+    a = 0.5 + (1/6)*(exp_a-_EXP_A_MIN)
+    return sigma_ci * (s**a)
+
+@njit(cache=True, nogil=True)
+def _k_ratio_core(depth):
+    """Brown-Hoek horizontal to vertical stress ratio"""
+    if depth < 300:
+        k = 1.5
+    else:
+        k = 0.65 + 1350/(depth+200)
+    return min(2.0, max(0.5, k))
+
+@njit(cache=True, nogil=True)
+def _stability_core(depth, rqd, ore_thickness, stress_factor):
+    """Vertical stress, k-ratio, horizontal stress and adjusted rock mass strength"""
+    sig_v = depth * stress_factor
+
+    k_ratio = _k_ratio_core(depth)
+    sig_h = sig_v * k_ratio
+
+    rock_s = _hoek_brown_core(rqd)
+    # Empirical ore thickness adjustment
+    rock_s *= (1 + 0.015*math.log(ore_thickness+1))
+    return sig_v, k_ratio, sig_h, rock_s
@@ -0,0 +1,27 @@
+import os
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# ============================================================================
+# FIGURE HELPERS SHARED BY THE CHART MODULES
+# ============================================================================
+# stability_analysis and cost_estimation both save their charts through these.
+
+# Fast zlib; the PDF report embeds re-optimized copies
+PNG_PIL_KWARGS = {'compress_level': 1, 'optimize': False}
+
+# Directories already created by _ensure_dir in this process
+_ENSURED_DIRS = set()
+
+def _ensure_dir(path):
+    """os.makedirs once per directory instead of on every save"""
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+def _new_figure(figsize):
+    """Agg-backed Figure created outside pyplot's figure registry"""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
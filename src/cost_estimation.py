@@ -1,10 +1,11 @@
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
 import os
 import logging
 import math
+import warnings
+from _figures import PNG_PIL_KWARGS, _ensure_dir, _new_figure
 
 # Visualization quality settings
 MAX_PIXEL_WIDTH = 2000  # Maximum pixel width for any image
@@ -33,7 +34,7 @@ def _save_fig(fig, filepath, max_w=MAX_PIXEL_WIDTH, max_h=MAX_PIXEL_HEIGHT, base
         edgecolor: figure edge color
     """
     # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    _ensure_dir(os.path.dirname(filepath))
     
     # Get figure dimensions in inches
     fig_w, fig_h = fig.get_size_inches()
@@ -52,16 +53,19 @@ def _save_fig(fig, filepath, max_w=MAX_PIXEL_WIDTH, max_h=MAX_PIXEL_HEIGHT, base
     
     # Save with calculated DPI
     # Use tight_bbox but catch warnings about tight layout issues
-    import warnings
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        fig.savefig(filepath, dpi=dpi_final, bbox_inches='tight', 
-                   facecolor=facecolor, edgecolor=edgecolor)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fig.savefig(filepath, dpi=dpi_final, bbox_inches='tight', 
+                       facecolor=facecolor, edgecolor=edgecolor, pil_kwargs=PNG_PIL_KWARGS)
+    finally:
+        # Free the artists now instead of waiting for the cyclic GC
+        fig.clear()
 
-def estimate_mining_costs(inputs, dimensions):
+def estimate_mining_costs(inputs, dimensions, visualize=True):
     """
     Estimate mining costs based on inputs and stope dimensions.
-    All costs are in INR (Indian Rupees).
+    All costs are in INR (Indian Rupees). visualize=False skips the cost charts.
     """
     # Calculate base costs in INR
     labor_cost = _calculate_labor_cost(dimensions)
@@ -73,7 +77,8 @@ def estimate_mining_costs(inputs, dimensions):
     total_cost = labor_cost + equipment_cost + support_cost + ventilation_cost
     
     # Generate cost visualization
-    _generate_cost_visualizations(labor_cost, equipment_cost, support_cost, ventilation_cost)
+    if visualize:
+        _generate_cost_visualizations(labor_cost, equipment_cost, support_cost, ventilation_cost)
     
     return {
         'labor': round(labor_cost, 2),
@@ -142,37 +147,35 @@ def _calculate_ventilation_cost(dimensions):
 
 def _generate_cost_visualizations(labor, equipment, support, ventilation):
     """Generate visualizations for cost breakdown"""
-    os.makedirs('reports', exist_ok=True)
-    
     # Create breakdown pie chart
-    fig = plt.figure(figsize=(10, 6))
+    fig = _new_figure((10, 6))
+    ax = fig.subplots()
     labels = ['Labor', 'Equipment', 'Support', 'Ventilation']
     costs = [labor, equipment, support, ventilation]
     colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
     
-    plt.pie(costs, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-    plt.axis('equal')
-    plt.title('Cost Breakdown by Category (INR)')
+    ax.pie(costs, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')
+    ax.set_title('Cost Breakdown by Category (INR)')
     _save_fig(fig, 'reports/cost_breakdown_chart.png')
-    plt.close()
     
     # Create bar chart for cost components
-    fig = plt.figure(figsize=(10, 6))
+    fig = _new_figure((10, 6))
+    ax = fig.subplots()
     x = np.arange(len(labels))
-    plt.bar(x, costs, color=colors)
-    plt.xlabel('Cost Components')
-    plt.ylabel('Cost (INR)')
-    plt.title('Mining Cost Components')
-    plt.xticks(x, labels)
+    ax.bar(x, costs, color=colors)
+    ax.set_xlabel('Cost Components')
+    ax.set_ylabel('Cost (INR)')
+    ax.set_title('Mining Cost Components')
+    ax.set_xticks(x, labels)
     
     # Add value labels on top of each bar
     for i, v in enumerate(costs):
-        plt.text(i, v + 0.05, f'INR{v:,.0f}', ha='center')
+        ax.text(i, v + 0.05, f'INR{v:,.0f}', ha='center')
     
     # Use subplots_adjust instead of tight_layout to avoid warnings
     fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
     _save_fig(fig, 'reports/cost_components_chart.png')
-    plt.close()
 
 def estimate_cost_per_ton(inputs, dimensions, costs):
     """
@@ -197,48 +200,46 @@ def estimate_cost_per_ton(inputs, dimensions, costs):
 
 def _generate_enhanced_cost_report(inputs, dimensions, costs, tonnage, cost_per_ton):
     """Generate comprehensive cost analysis report"""
-    os.makedirs('reports', exist_ok=True)
-    
     # Create enhanced cost breakdown chart with INR values
-    fig = plt.figure(figsize=(12, 8))
+    fig = _new_figure((12, 8))
+    ax = fig.subplots()
     
     # Cost breakdown pie chart
     labels = ['Labor', 'Equipment', 'Support', 'Ventilation']
     costs_values = [costs['labor'], costs['equipment'], costs['support'], costs['ventilation']]
     colors = ['#FF9999', '#66B3FF', '#99FF99', '#FFCC99']
     
-    plt.pie(costs_values, labels=labels, colors=colors, autopct=lambda p: f'{p:.1f}%\n(₹{p*costs["total"]/100:.1f}L)', 
-            startangle=90, wedgeprops={'edgecolor': 'white', 'linewidth': 2})
-    plt.axis('equal')
+    ax.pie(costs_values, labels=labels, colors=colors, autopct=lambda p: f'{p:.1f}%\n(₹{p*costs["total"]/100:.1f}L)', 
+           startangle=90, wedgeprops={'edgecolor': 'white', 'linewidth': 2})
+    ax.axis('equal')
     
-    plt.title('Mining Cost Distribution\n' + 
+    ax.set_title('Mining Cost Distribution\n' + 
               f'Total: ₹{costs["total"]/100000:.2f}L | Per Ton: ₹{cost_per_ton:.2f}\n' +
               f'Ore Volume: {dimensions["volume"]}m³ | Tonnage: {tonnage:.1f}t', 
               fontsize=14, fontweight='bold')
     
     _save_fig(fig, 'reports/cost_breakdown_chart.png')
-    plt.close()
     
     # Create cost components chart
-    fig = plt.figure(figsize=(12, 6))
+    fig = _new_figure((12, 6))
+    ax = fig.subplots()
     x = np.arange(len(labels))
     
-    plt.bar(x, costs_values, color=colors, width=0.6, edgecolor='black', linewidth=1.5)
-    plt.xlabel('Cost Components', fontsize=12)
-    plt.ylabel('Cost (₹)', fontsize=12)
-    plt.title('Mining Cost Components Breakdown', fontsize=14, fontweight='bold')
-    plt.xticks(x, labels, fontsize=10)
-    plt.grid(axis='y', alpha=0.3)
+    ax.bar(x, costs_values, color=colors, width=0.6, edgecolor='black', linewidth=1.5)
+    ax.set_xlabel('Cost Components', fontsize=12)
+    ax.set_ylabel('Cost (₹)', fontsize=12)
+    ax.set_title('Mining Cost Components Breakdown', fontsize=14, fontweight='bold')
+    ax.set_xticks(x, labels, fontsize=10)
+    ax.grid(axis='y', alpha=0.3)
     
     # Add value labels on top of each bar
     for i, v in enumerate(costs_values):
-        plt.text(i, v + max(costs_values)*0.02, f'₹{v/100000:.2f}L\n({v/costs["total"]*100:.1f}%)', 
+        ax.text(i, v + max(costs_values)*0.02, f'₹{v/100000:.2f}L\n({v/costs["total"]*100:.1f}%)', 
                 ha='center', fontsize=10, fontweight='bold')
     
     # Use subplots_adjust instead of tight_layout to avoid warnings
     fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.15)
     _save_fig(fig, 'reports/cost_components_chart.png')
-    plt.close()
 
 # Legacy function for backward compatibility
 def generate_cost_breakdown(costs):
@@ -5,8 +5,10 @@ import traceback
 import threading
 from stope_calculations import calculate_stope_design, summarize_results
 from input_validation import validate_inputs
-from report_generator import generate_pdf_report, generate_summary_text
-from stability_analysis import determine_stope_type, calculate_stope_dimensions, assess_stability
+from report_generator import generate_all_reports, generate_summary_text
+from stability_analysis import (
+    determine_stope_type, calculate_stope_dimensions, assess_stability, wait_for_visualizations,
+)
 from cost_estimation import estimate_mining_costs
 
 # Indian Mining Constants
@@ -378,6 +380,10 @@ class MiningStopeDesignApp:
             for widget in tab.winfo_children():
                 widget.destroy()
 
+        # calculate_stope_design returns with the PNGs published; this also
+        # covers renders another thread still has in flight
+        wait_for_visualizations()
+
         # Display enhanced visualizations
         visualization_files = [
             ('reports/stope_3d_isometric.png', self.viz_3d_tab, "3D Isometric View"),
@@ -472,8 +478,10 @@ class MiningStopeDesignApp:
                 os.makedirs(folder, exist_ok=True)
                 filepath = f"{folder}/stope_report.pdf"
                 try:
-                    generate_pdf_report(results, filepath, notes)
-                    self.root.after(0, lambda: self.results_text.insert(tk.END, f"\nPDF report exported automatically to: {filepath}\n", "compliant"))
+                    # The report folder also gets the text summary, written
+                    # alongside the PDF on its own thread
+                    generate_all_reports(results, f"{folder}/stope_summary.txt", filepath, notes)
+                    self.root.after(0, lambda: self.results_text.insert(tk.END, f"\nPDF report and summary exported automatically to: {folder}\n", "compliant"))
                 except Exception as e:
                     self.root.after(0, lambda e=e: self._show_error(f"PDF export failed: {e}"))
             else:
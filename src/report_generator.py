@@ -1,10 +1,10 @@
+import io
 import os
-import matplotlib
-matplotlib.use('Agg')
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from fpdf import FPDF
-import matplotlib.pyplot as plt
-import numpy as np
+from functools import lru_cache
 import logging
 
 # Configure logging
@@ -19,187 +19,375 @@ DGMS_REFERENCES = {
     'pillar_design': 'DGMS (Tech)(SCR) Circular No. 01 of 2019'
 }
 
-def generate_summary_text(results, filename='reports/stope_summary.txt', notes=None):
+# Rendered visualizations embedded in the PDF report, in page order
+VISUALIZATION_FILES = [
+    ('reports/stope_3d_isometric.png', 'Realistic 3D Stope Visualization'),
+    ('reports/stope_cross_sections.png', 'Cross-Sectional Views'),
+    ('reports/stope_plan_view.png', 'Plan View Layout'),
+    ('reports/safety_factor_gauge.png', 'Safety Factor Analysis'),
+    ('reports/stress_strength_comparison.png', 'Stress vs Strength Analysis')
+]
+
+# Static blocks of the text summary, built once at import instead of per report
+_SUMMARY_HEADER = ("=" * 60, "         ADVANCED MINING STOPE DESIGN ANALYSIS", "=" * 60)
+_SUMMARY_SPEC_HEADING = ("STOPE CONFIGURATION & SPECIFICATIONS", "-" * 40)
+_SUMMARY_STABILITY_HEADING = ("GEOTECHNICAL STABILITY ANALYSIS", "-" * 35)
+_SUMMARY_REGULATIONS_HEADING = ("INDIAN MINING REGULATIONS COMPLIANCE", "-" * 38)
+_SUMMARY_COST_HEADING = ("COMPREHENSIVE COST ANALYSIS (INR)", "-" * 33)
+_SUMMARY_WARNINGS_HEADING = ("DGMS SAFETY ALERTS & COMPLIANCE NOTES", "-" * 40)
+_SUMMARY_NOTES_HEADING = ("ADDITIONAL TECHNICAL NOTES", "-" * 28)
+_SUMMARY_DGMS_LINES = tuple(
+    f"• {key.replace('_', ' ').title()}: {reference}" for key, reference in DGMS_REFERENCES.items()
+)
+_SUMMARY_VIZ_BLOCK = (
+    "GENERATED VISUALIZATION FILES",
+    "-" * 30,
+    "• stope_3d_isometric.png - Realistic 3D stope visualization",
+    "• stope_cross_sections.png - Longitudinal and cross-sectional views",
+    "• stope_plan_view.png - Plan view layout with infrastructure",
+    "• safety_factor_gauge.png - DGMS compliance gauge",
+    "• stress_strength_comparison.png - Geotechnical analysis"
+)
+
+# (label prefix, results key, unit suffix) rows of the text summary
+_SUMMARY_SPEC_FIELDS = (
+    ("Length: ", 'length', " meters"),
+    ("Width: ", 'width', " meters"),
+    ("Height: ", 'height', " meters"),
+    ("Volume: ", 'volume', " cubic meters"),
+    ("Hydraulic Radius: ", 'hydraulic_radius', " meters"),
+    ("Rock Mass Rating (RMR): ", 'rmr', ""),
+    ("Q Value: ", 'q_value', ""),
+    ("Stability Number: ", 'stability_number', "")
+)
+_SUMMARY_STABILITY_FIELDS = (
+    ("Stability Class: ", 'stability_class', ""),
+    ("Vertical Stress: ", 'vertical_stress', " MPa"),
+    ("Horizontal Stress: ", 'horizontal_stress', " MPa"),
+    ("Rock Strength: ", 'rock_strength', " MPa")
+)
+
+# Placeholders for result fields missing from a design, merged under the
+# results once per report so the layout code can use plain subscripts
+_DIMENSION_DEFAULTS = dict.fromkeys(
+    ('length', 'width', 'height', 'volume', 'hydraulic_radius', 'rmr', 'q_value', 'stability_number'), 'N/A'
+)
+_STABILITY_DEFAULTS = dict.fromkeys(
+    ('safety_factor', 'stability_class', 'vertical_stress', 'horizontal_stress', 'rock_strength'), 'N/A'
+)
+
+# Font family used for the report body. Helvetica is tried on the first PDF;
+# if it is unavailable every later call goes straight to Arial.
+_HELVETICA_OK = None
+
+def _set_font(pdf, style, size):
+    """Set the report font, falling back to Arial once Helvetica has failed"""
+    global _HELVETICA_OK
+    if _HELVETICA_OK is False:
+        pdf.set_font('Arial', style, size)
+        return
+    try:
+        pdf.set_font('Helvetica', style, size)
+        _HELVETICA_OK = True
+    except Exception:
+        _HELVETICA_OK = False
+        pdf.set_font('Arial', style, size)
+
+# Report colours as RGB tuples
+_BLACK = (0, 0, 0)
+_GRAY = (128, 128, 128)
+_NAVY = (25, 25, 112)
+_DARK_BLUE = (0, 0, 139)
+_GREEN = (0, 128, 0)
+_RED = (255, 0, 0)
+_LAVENDER = (230, 230, 250)
+
+def _set_color(pdf, kind, rgb):
+    """Set the 'text' or 'fill' colour, skipping the call when it is already active"""
+    attr = f'_report_{kind}_color'
+    if getattr(pdf, attr, None) != rgb:
+        setattr(pdf, attr, rgb)
+        getattr(pdf, f'set_{kind}_color')(*rgb)
+
+# Banner cell height plus the gap below it
+_SECTION_HEADING_HEIGHT = 10 + 5
+
+def _section_heading(pdf, text):
+    """
+    Draw a lavender section banner as a plain cell.
+
+    The page break is decided from the known banner height before drawing, so
+    a banner is never left alone at the foot of a page. FPDF's start_section
+    is deliberately not used; it deep-copies the document state per call.
+    """
+    from fpdf.enums import XPos, YPos
+    _set_font(pdf, 'B', 14)
+    if pdf.get_y() + _SECTION_HEADING_HEIGHT > pdf.page_break_trigger:
+        pdf.add_page()
+    _set_color(pdf, 'fill', _LAVENDER)
+    pdf.cell(0, 10, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
+    pdf.ln(5)
+
+# Hidden document used only to measure strings for _str_width
+_WIDTH_PDF = None
+_WIDTH_LOCK = threading.Lock()
+
+@lru_cache(maxsize=4096)
+def _str_width(family, style, size, text):
+    """Memoized get_string_width for a (font, text) pair, shared across reports"""
+    global _WIDTH_PDF
+    with _WIDTH_LOCK:
+        if _WIDTH_PDF is None:
+            from fpdf import FPDF
+            _WIDTH_PDF = FPDF()
+        _WIDTH_PDF.set_font(family, style, size)
+        return _WIDTH_PDF.get_string_width(text)
+
+# Pixel width of a visualization embedded at w=170 mm and 200 dpi
+_EMBED_MAX_WIDTH_PX = 1340
+
+def _optimize_visualization(viz_file):
+    """
+    Return a palette-quantized copy of a rendered PNG for embedding in the PDF.
+
+    Matplotlib writes full-colour RGBA PNGs; an 8-bit palette image is several
+    times smaller and much cheaper for FPDF to embed. Images wider than the
+    embedded 170 mm at 200 dpi are downsampled first since the extra pixels
+    are never visible. The copy is kept next to the source as *_opt.png and
+    only rebuilt when the source is newer.
+    """
+    root, ext = os.path.splitext(viz_file)
+    opt_file = f"{root}_opt{ext}"
+    try:
+        if os.stat(opt_file).st_mtime_ns > os.stat(viz_file).st_mtime_ns:
+            return opt_file
+    except OSError:
+        pass
+    from PIL import Image
+    with Image.open(viz_file) as im:
+        if im.mode != 'RGB':
+            im = im.convert('RGB')
+        if im.width > _EMBED_MAX_WIDTH_PX:
+            height = round(im.height * _EMBED_MAX_WIDTH_PX / im.width)
+            im = im.resize((_EMBED_MAX_WIDTH_PX, height), Image.LANCZOS)
+        im = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        # Write to a private temp file so concurrent reports never read a partial PNG
+        tmp_file = f"{opt_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        im.save(tmp_file, format='PNG', optimize=True, compress_level=9)
+    os.replace(tmp_file, opt_file)
+    return opt_file
+
+def _read_visualization(viz_file):
+    """Read a rendered PNG into memory so FPDF embeds it without re-opening the file"""
+    with open(viz_file, 'rb') as f:
+        return io.BytesIO(f.read())
+
+# Cost components itemized in both reports, in display order
+_COST_ITEMS = tuple((item, item.title()) for item in ('labor', 'equipment', 'support', 'ventilation'))
+
+def _cost_breakdown(costs, total_cost):
+    """(title, value, percentage of total) for each cost component present"""
+    return [
+        (title, costs[item], (costs[item] / total_cost * 100) if total_cost > 0 else 0)
+        for item, title in _COST_ITEMS if item in costs
+    ]
+
+# Column widths, in characters, of the monospaced PDF tables
+_TABLE_LABEL_WIDTH = 28
+_TABLE_VALUE_WIDTH = 40
+
+def _format_table(rows):
+    """Lay out (label, value) pairs as dot-leadered monospaced lines"""
+    return "\n".join(
+        f"{label:.<{_TABLE_LABEL_WIDTH}}{value!s:.>{_TABLE_VALUE_WIDTH}}" for label, value in rows
+    )
+
+def _new_report_pdf():
+    """
+    Fresh document with the first page and report margins set up.
+
+    A new FPDF costs tens of microseconds, so documents are not pooled; reusing
+    one would risk leaking pages or font state from a previous report.
+    """
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    # Set up page margins for better text rendering
+    pdf.set_margins(20, 20, 20)
+    return pdf
+
+def _write_pdf(pdf, filename):
+    """Serialize the document once and write it through a large buffer"""
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        f.write(pdf.output())
+
+def _existing_visualizations():
+    """Paths of the visualization files on disk, from one listing per directory"""
+    existing = set()
+    for directory in {os.path.dirname(viz_file) for viz_file, _ in VISUALIZATION_FILES}:
+        try:
+            with os.scandir(directory or '.') as entries:
+                existing.update(os.path.join(directory, entry.name) for entry in entries)
+        except OSError:
+            pass
+    return existing
+
+def _wait_for_visualizations():
+    """Let figure saves still queued by stability_analysis land in reports/"""
+    # Looked up rather than imported, so reports alone never load matplotlib
+    stability_analysis = sys.modules.get('stability_analysis')
+    if stability_analysis is not None:
+        stability_analysis.wait_for_visualizations()
+
+def _snapshot_visualization(viz_file):
+    """Optimized in-memory copy of one visualization, or None if it cannot be read"""
+    try:
+        try:
+            embed_file = _optimize_visualization(viz_file)
+        except Exception as e:
+            _report_logger.warning(f"Embedding {viz_file} unoptimized: {e}")
+            embed_file = viz_file
+        return _read_visualization(embed_file)
+    except OSError as e:
+        _report_logger.error(f"Failed to read visualization {viz_file}: {e}")
+        return None
+
+def generate_summary_text(results, filename='reports/stope_summary.txt', notes=None, generated_at=None):
     """Generate comprehensive text summary with enhanced stope information"""
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     
-    stability = results.get('stability', {})
-    dimensions = results.get('dimensions', {})
+    stability = {**_STABILITY_DEFAULTS, **results.get('stability', {})}
+    dimensions = {**_DIMENSION_DEFAULTS, **results.get('dimensions', {})}
     costs = results.get('costs', {})
     dgms_warnings = results.get('dgms_warnings', [])
     stope_type = results.get('stope_type', 'Unknown')
     
-    summary = []
-    summary.append("=" * 60)
-    summary.append("         ADVANCED MINING STOPE DESIGN ANALYSIS")
-    summary.append("=" * 60)
-    summary.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S IST')}")
-    summary.append(f"Compliant with: DGMS, MMR & IBM Standards")
+    summary = list(_SUMMARY_HEADER)
+    summary.append(f"Generated: {(generated_at or datetime.now()).strftime('%Y-%m-%d %H:%M:%S IST')}")
+    summary.append("Compliant with: DGMS, MMR & IBM Standards")
     summary.append("")
     
     # Enhanced stope configuration
-    summary.append("STOPE CONFIGURATION & SPECIFICATIONS")
-    summary.append("-" * 40)
+    summary.extend(_SUMMARY_SPEC_HEADING)
     summary.append(f"Mining Method: {stope_type}")
-    summary.append(f"Length: {dimensions.get('length', 'N/A')} meters")
-    summary.append(f"Width: {dimensions.get('width', 'N/A')} meters") 
-    summary.append(f"Height: {dimensions.get('height', 'N/A')} meters")
-    summary.append(f"Volume: {dimensions.get('volume', 'N/A')} cubic meters")
-    summary.append(f"Hydraulic Radius: {dimensions.get('hydraulic_radius', 'N/A')} meters")
-    summary.append(f"Rock Mass Rating (RMR): {dimensions.get('rmr', 'N/A')}")
-    summary.append(f"Q Value: {dimensions.get('q_value', 'N/A')}")
-    summary.append(f"Stability Number: {dimensions.get('stability_number', 'N/A')}")
+    summary.extend(f"{label}{dimensions[key]}{unit}" for label, key, unit in _SUMMARY_SPEC_FIELDS)
     summary.append("")
     
     # Detailed stability analysis
-    summary.append("GEOTECHNICAL STABILITY ANALYSIS")
-    summary.append("-" * 35)
-    safety_factor = stability.get('safety_factor', 'N/A')
+    summary.extend(_SUMMARY_STABILITY_HEADING)
+    safety_factor = stability['safety_factor']
     dgms_compliant = stability.get('dgms_compliant', False)
     compliance_text = "[✓ COMPLIANT]" if dgms_compliant else "[✗ NON-COMPLIANT]"
     
     summary.append(f"Safety Factor: {safety_factor} {compliance_text}")
-    summary.append(f"Stability Class: {stability.get('stability_class', 'N/A')}")
-    summary.append(f"Vertical Stress: {stability.get('vertical_stress', 'N/A')} MPa")
-    summary.append(f"Horizontal Stress: {stability.get('horizontal_stress', 'N/A')} MPa")
-    summary.append(f"Rock Strength: {stability.get('rock_strength', 'N/A')} MPa")
+    summary.extend(f"{label}{stability[key]}{unit}" for label, key, unit in _SUMMARY_STABILITY_FIELDS)
     summary.append("")
     
     # Indian regulations compliance
-    summary.append("INDIAN MINING REGULATIONS COMPLIANCE")
-    summary.append("-" * 38)
-    for key, reference in DGMS_REFERENCES.items():
-        summary.append(f"• {key.replace('_', ' ').title()}: {reference}")
+    summary.extend(_SUMMARY_REGULATIONS_HEADING)
+    summary.extend(_SUMMARY_DGMS_LINES)
     summary.append("")
     
     # Enhanced cost analysis
     if costs:
-        summary.append("COMPREHENSIVE COST ANALYSIS (INR)")
-        summary.append("-" * 33)
+        summary.extend(_SUMMARY_COST_HEADING)
         total_cost = costs.get('total', 0)
         summary.append(f"Total Project Cost: ₹{total_cost:,.2f}")
         summary.append("")
         summary.append("Detailed Cost Breakdown:")
         
-        cost_items = ['labor', 'equipment', 'support', 'ventilation']
-        for item in cost_items:
-            if item in costs:
-                summary.append(f"  • {item.title()} Costs: ₹{costs[item]:,.2f}")
+        breakdown = _cost_breakdown(costs, total_cost)
+        summary.extend(f"  • {title} Costs: ₹{value:,.2f}" for title, value, _ in breakdown)
         
         if total_cost > 0:
             summary.append("")
             summary.append("Cost Distribution:")
-            for item in cost_items:
-                if item in costs:
-                    percentage = (costs[item] / total_cost) * 100
-                    summary.append(f"  • {item.title()}: {percentage:.1f}%")
+            summary.extend(f"  • {title}: {percentage:.1f}%" for title, _, percentage in breakdown)
         summary.append("")
     
     # Safety alerts and warnings
     if dgms_warnings:
-        summary.append("DGMS SAFETY ALERTS & COMPLIANCE NOTES")
-        summary.append("-" * 40)
+        summary.extend(_SUMMARY_WARNINGS_HEADING)
         for i, warning in enumerate(dgms_warnings, 1):
             summary.append(f"{i}. {warning}")
         summary.append("")
     
     # Additional technical notes
     if notes:
-        summary.append("ADDITIONAL TECHNICAL NOTES")
-        summary.append("-" * 28)
+        summary.extend(_SUMMARY_NOTES_HEADING)
         summary.append(notes)
         summary.append("")
     
     # Generated visualizations
-    summary.append("GENERATED VISUALIZATION FILES")
-    summary.append("-" * 30)
-    viz_files = [
-        "stope_3d_isometric.png - Realistic 3D stope visualization",
-        "stope_cross_sections.png - Longitudinal and cross-sectional views", 
-        "stope_plan_view.png - Plan view layout with infrastructure",
-        "safety_factor_gauge.png - DGMS compliance gauge",
-        "stress_strength_comparison.png - Geotechnical analysis"
-    ]
-    for viz_file in viz_files:
-        summary.append(f"• {viz_file}")
+    summary.extend(_SUMMARY_VIZ_BLOCK)
     
-    # Save summary
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(summary))
+    # Encode once and save summary in a single buffered write
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        f.write('\n'.join(summary).encode('utf-8'))
     
     return filename
 
-def generate_pdf_report(results, filename='reports/stope_report.pdf', notes=None):
+def generate_pdf_report(results, filename='reports/stope_report.pdf', notes=None, generated_at=None):
     """Generate comprehensive PDF report with enhanced visualizations and PowerShell compatibility"""
+    # Imported here so text-only callers never pay for loading fpdf
+    from fpdf.enums import XPos, YPos
     try:
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         
         _report_logger.info(f"Generating PDF report: {filename}")
         
-        stability = results.get('stability', {})
-        dimensions = results.get('dimensions', {})
+        stability = {**_STABILITY_DEFAULTS, **results.get('stability', {})}
+        dimensions = {**_DIMENSION_DEFAULTS, **results.get('dimensions', {})}
         costs = results.get('costs', {})
         dgms_warnings = results.get('dgms_warnings', [])
         stope_type = results.get('stope_type', 'Unknown')
         
+        # Snapshot the visualizations before layout starts so a concurrent
+        # design run rewriting reports/ cannot mix images from two designs
+        # PIL releases the GIL while quantizing, so the PNGs are prepared in parallel
+        _wait_for_visualizations()
+        existing = _existing_visualizations()
+        present = [viz_file for viz_file, _ in VISUALIZATION_FILES if viz_file in existing]
+        viz_images = {}
+        if present:
+            with ThreadPoolExecutor(max_workers=len(present)) as pool:
+                for viz_file, image in zip(present, pool.map(_snapshot_visualization, present)):
+                    if image is not None:
+                        viz_images[viz_file] = image
+        
         # Initialize PDF with enhanced formatting and safe font handling
-        pdf = FPDF()
-        pdf.add_page()
+        pdf = _new_report_pdf()
         pdf.set_auto_page_break(auto=True, margin=15)
         
-        # Use built-in fonts to avoid substitution issues
-        # Set up page margins for better text rendering
-        pdf.set_margins(20, 20, 20)
-        
         # Enhanced header with safe font handling
-        try:
-            pdf.set_font('Helvetica', 'B', 18)  # Use Helvetica instead of Arial
-        except:
-            pdf.set_font('Arial', 'B', 18)  # Fallback to Arial
+        _set_font(pdf, 'B', 18)
             
-        pdf.set_text_color(25, 25, 112)  # Navy blue
-        pdf.cell(0, 15, 'MINING STOPE DESIGN REPORT', ln=True, align='C')
+        _set_color(pdf, 'text', _NAVY)
+        pdf.cell(0, 15, 'MINING STOPE DESIGN REPORT', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
         
-        try:
-            pdf.set_font('Helvetica', 'I', 11)
-        except:
-            pdf.set_font('Arial', 'I', 11)
+        _set_font(pdf, 'I', 11)
             
-        pdf.set_text_color(128, 128, 128)  # Gray
-        pdf.cell(0, 8, f'Generated: {datetime.now().strftime("%Y-%m-%d %H:%M IST")}', ln=True, align='C')
-        pdf.cell(0, 8, 'DGMS, MMR & IBM Compliant', ln=True, align='C')
+        _set_color(pdf, 'text', _GRAY)
+        pdf.cell(0, 8, f'Generated: {(generated_at or datetime.now()).strftime("%Y-%m-%d %H:%M IST")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        pdf.cell(0, 8, 'DGMS, MMR & IBM Compliant', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
         pdf.ln(10)
         
         # Reset text color
-        pdf.set_text_color(0, 0, 0)
+        _set_color(pdf, 'text', _BLACK)
         
         # Executive Summary with safe text handling
-        try:
-            pdf.set_font('Helvetica', 'B', 14)
-        except:
-            pdf.set_font('Arial', 'B', 14)
-            
-        pdf.set_fill_color(230, 230, 250)  # Lavender
-        pdf.cell(0, 10, 'EXECUTIVE SUMMARY', ln=True, fill=True)
-        pdf.ln(5)
+        _section_heading(pdf, 'EXECUTIVE SUMMARY')
 
-        try:
-            pdf.set_font('Helvetica', '', 10)
-        except:
-            pdf.set_font('Arial', '', 10)
+        _set_font(pdf, '', 10)
             
-        safety_factor = stability.get('safety_factor', 'N/A')
+        safety_factor = stability['safety_factor']
         dgms_compliant = stability.get('dgms_compliant', False)
         total_cost = costs.get('total', 0)
 
         # Create shorter, safer text blocks
-        length_val = dimensions.get('length', 'N/A')
-        width_val = dimensions.get('width', 'N/A')
-        height_val = dimensions.get('height', 'N/A')
-        
         summary_lines = [
             f"Stope Type: {stope_type}",
-            f"Dimensions: {length_val}m x {width_val}m x {height_val}m",
+            f"Dimensions: {dimensions['length']}m x {dimensions['width']}m x {dimensions['height']}m",
             f"Safety Factor: {safety_factor}",
             f"DGMS Status: {'Compliant' if dgms_compliant else 'Non-Compliant'}",
             f"Estimated Cost: INR {total_cost:,.0f}"
@@ -208,184 +396,133 @@ def generate_pdf_report(results, filename='reports/stope_report.pdf', notes=None
         for line in summary_lines:
             # Ensure line fits on page with safe width calculation
             try:
-                line_width = pdf.get_string_width(line)
+                line_width = _str_width(pdf.font_family, pdf.font_style, pdf.font_size_pt, line)
                 if line_width > 170:  # Max safe width
-                    pdf.multi_cell(0, 6, line)
+                    pdf.multi_cell(0, 6, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 else:
-                    pdf.cell(0, 6, line, ln=True)
+                    pdf.cell(0, 6, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             except:
                 # Fallback: always use multi_cell for safety
-                pdf.multi_cell(0, 6, line)
+                pdf.multi_cell(0, 6, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         pdf.ln(5)
         # Technical Specifications with safe formatting
-        try:
-            pdf.set_font('Helvetica', 'B', 14)
-        except:
-            pdf.set_font('Arial', 'B', 14)
-            
-        pdf.set_fill_color(230, 230, 250)
-        pdf.cell(0, 10, 'TECHNICAL SPECIFICATIONS', ln=True, fill=True)
-        pdf.ln(5)
+        _section_heading(pdf, 'TECHNICAL SPECIFICATIONS')
         
-        try:
-            pdf.set_font('Helvetica', 'B', 12)
-        except:
-            pdf.set_font('Arial', 'B', 12)
+        _set_font(pdf, 'B', 12)
             
-        pdf.cell(0, 8, 'Stope Configuration:', ln=True)
-        
-        try:
-            pdf.set_font('Helvetica', '', 10)
-        except:
-            pdf.set_font('Arial', '', 10)
+        pdf.cell(0, 8, 'Stope Configuration:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         spec_data = [
             ('Mining Method', stope_type),
-            ('Length', f"{dimensions.get('length', 'N/A')} m"),
-            ('Width', f"{dimensions.get('width', 'N/A')} m"),
-            ('Height', f"{dimensions.get('height', 'N/A')} m"),
-            ('Volume', f"{dimensions.get('volume', 'N/A')} m3"),
-            ('Hydraulic Radius', f"{dimensions.get('hydraulic_radius', 'N/A')} m"),
-            ('Rock Mass Rating', f"{dimensions.get('rmr', 'N/A')}"),
-            ('Q Value', f"{dimensions.get('q_value', 'N/A')}"),
-            ('Stability Number', f"{dimensions.get('stability_number', 'N/A')}")
+            ('Length', f"{dimensions['length']} m"),
+            ('Width', f"{dimensions['width']} m"),
+            ('Height', f"{dimensions['height']} m"),
+            ('Volume', f"{dimensions['volume']} m3"),
+            ('Hydraulic Radius', f"{dimensions['hydraulic_radius']} m"),
+            ('Rock Mass Rating', f"{dimensions['rmr']}"),
+            ('Q Value', f"{dimensions['q_value']}"),
+            ('Stability Number', f"{dimensions['stability_number']}")
         ]
         
-        for label, value in spec_data:
-            try:
-                # Use safe cell widths to prevent overflow
-                pdf.cell(70, 6, f'{label}:', ln=0)
-                pdf.cell(100, 6, str(value), ln=True)
-            except:
-                # Fallback to multi_cell for problematic content
-                pdf.multi_cell(0, 6, f'{label}: {value}')
+        # Monospaced rows keep the two columns aligned in a single multi_cell
+        pdf.set_font('Courier', '', 10)
+        pdf.multi_cell(0, 6, _format_table(spec_data), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         pdf.ln(5)
         # Stability Analysis with improved formatting
-        try:
-            pdf.set_font('Helvetica', 'B', 12)
-        except:
-            pdf.set_font('Arial', 'B', 12)
+        _set_font(pdf, 'B', 12)
             
-        pdf.cell(0, 8, 'Geotechnical Analysis:', ln=True)
-        
-        try:
-            pdf.set_font('Helvetica', '', 10)
-        except:
-            pdf.set_font('Arial', '', 10)
+        pdf.cell(0, 8, 'Geotechnical Analysis:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         compliance_text = "COMPLIANT" if dgms_compliant else "NON-COMPLIANT"
         stability_data = [
-            ('Safety Factor', f"{safety_factor} ({compliance_text})"),
-            ('Stability Class', stability.get('stability_class', 'N/A')),
-            ('Vertical Stress', f"{stability.get('vertical_stress', 'N/A')} MPa"),
-            ('Horizontal Stress', f"{stability.get('horizontal_stress', 'N/A')} MPa"),
-            ('Rock Strength', f"{stability.get('rock_strength', 'N/A')} MPa")
+            ('Stability Class', stability['stability_class']),
+            ('Vertical Stress', f"{stability['vertical_stress']} MPa"),
+            ('Horizontal Stress', f"{stability['horizontal_stress']} MPa"),
+            ('Rock Strength', f"{stability['rock_strength']} MPa")
         ]
         
-        for label, value in stability_data:
-            try:
-                pdf.cell(70, 6, f'{label}:', ln=0)
-                if 'NON-COMPLIANT' in str(value):
-                    pdf.set_text_color(255, 0, 0)  # Red
-                elif 'COMPLIANT' in str(value):
-                    pdf.set_text_color(0, 128, 0)  # Green
-                pdf.cell(100, 6, str(value), ln=True)
-                pdf.set_text_color(0, 0, 0)  # Reset to black
-            except:
-                # Fallback for problematic content
-                pdf.multi_cell(0, 6, f'{label}: {value}')
+        # Only the safety factor row is coloured, so it is laid out as its
+        # own one-row table, aligned with the rows below it
+        pdf.set_font('Courier', '', 10)
+        if dgms_compliant:
+            _set_color(pdf, 'text', _GREEN)
+        else:
+            _set_color(pdf, 'text', _RED)
+        safety_row = [('Safety Factor', f"{safety_factor} ({compliance_text})")]
+        pdf.multi_cell(0, 6, _format_table(safety_row), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        _set_color(pdf, 'text', _BLACK)
+        pdf.multi_cell(0, 6, _format_table(stability_data), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         pdf.ln(10)
     
         # Add enhanced visualizations with better error handling
-        visualization_files = [
-            ('reports/stope_3d_isometric.png', 'Realistic 3D Stope Visualization'),
-            ('reports/stope_cross_sections.png', 'Cross-Sectional Views'),
-            ('reports/stope_plan_view.png', 'Plan View Layout'),
-            ('reports/safety_factor_gauge.png', 'Safety Factor Analysis'),
-            ('reports/stress_strength_comparison.png', 'Stress vs Strength Analysis')
-        ]
-        
-        for viz_file, caption in visualization_files:
+        for viz_file, caption in VISUALIZATION_FILES:
             pdf.add_page()
-            try:
-                pdf.set_font('Helvetica', 'B', 14)
-            except:
-                pdf.set_font('Arial', 'B', 14)
+            _set_font(pdf, 'B', 14)
                 
-            pdf.cell(0, 10, caption, ln=True, align='C')
+            pdf.cell(0, 10, caption, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             pdf.ln(5)
             
-            if os.path.exists(viz_file):
+            if viz_file in viz_images:
                 try:
                     _report_logger.info(f"Embedding visualization: {viz_file}")
                     # Use smaller width to ensure fit
-                    pdf.image(viz_file, x=15, w=170)
+                    pdf.image(viz_images[viz_file], x=15, w=170)
                 except Exception as e:
-                    try:
-                        pdf.set_font('Helvetica', '', 10)
-                    except:
-                        pdf.set_font('Arial', '', 10)
-                    pdf.multi_cell(0, 6, f'[Error loading {caption}: {str(e)}]')
+                    _set_font(pdf, '', 10)
+                    pdf.multi_cell(0, 6, f'[Error loading {caption}: {str(e)}]', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                     _report_logger.error(f"Failed to embed image {viz_file} in PDF: {str(e)}")
             else:
-                try:
-                    pdf.set_font('Helvetica', '', 10)
-                except:
-                    pdf.set_font('Arial', '', 10)
-                pdf.multi_cell(0, 6, f'[Missing visualization: {caption}]')
+                _set_font(pdf, '', 10)
+                pdf.multi_cell(0, 6, f'[Missing visualization: {caption}]', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 _report_logger.warning(f"Missing visualization file: {viz_file}")
             pdf.ln(10)
             
         # Cost Analysis with improved formatting
         if costs:
             pdf.add_page()
-            try:
-                pdf.set_font('Helvetica', 'B', 14)
-            except:
-                pdf.set_font('Arial', 'B', 14)
-                
-            pdf.set_fill_color(230, 230, 250)
-            pdf.cell(0, 10, 'COST ANALYSIS (INR)', ln=True, fill=True)
-            pdf.ln(5)
+            _section_heading(pdf, 'COST ANALYSIS (INR)')
             
-            try:
-                pdf.set_font('Helvetica', 'B', 12)
-            except:
-                pdf.set_font('Arial', 'B', 12)
+            _set_font(pdf, 'B', 12)
                 
-            pdf.set_text_color(0, 0, 139)  # Dark blue
-            pdf.cell(0, 8, f'Total Project Cost: INR {total_cost:,.0f}', ln=True)
-            pdf.set_text_color(0, 0, 0)
+            _set_color(pdf, 'text', _DARK_BLUE)
+            pdf.cell(0, 8, f'Total Project Cost: INR {total_cost:,.0f}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            _set_color(pdf, 'text', _BLACK)
             pdf.ln(5)
             
-            try:
-                pdf.set_font('Helvetica', 'B', 11)
-            except:
-                pdf.set_font('Arial', 'B', 11)
+            _set_font(pdf, 'B', 11)
                 
-            pdf.cell(0, 8, 'Detailed Cost Breakdown:', ln=True)
+            pdf.cell(0, 8, 'Detailed Cost Breakdown:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             
-            try:
-                pdf.set_font('Helvetica', '', 10)
-            except:
-                pdf.set_font('Arial', '', 10)
+            _set_font(pdf, '', 10)
                 
-            cost_items = ['labor', 'equipment', 'support', 'ventilation']
-            for item in cost_items:
-                if item in costs:
-                    percentage = (costs[item] / total_cost * 100) if total_cost > 0 else 0
-                    cost_line = f'  - {item.title()}: INR {costs[item]:,.0f} ({percentage:.1f}%)'
-                    try:
-                        pdf.cell(0, 6, cost_line, ln=True)
-                    except:
-                        pdf.multi_cell(0, 6, cost_line)
+            for title, value, percentage in _cost_breakdown(costs, total_cost):
+                cost_line = f'  - {title}: INR {value:,.0f} ({percentage:.1f}%)'
+                try:
+                    pdf.cell(0, 6, cost_line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                except:
+                    pdf.multi_cell(0, 6, cost_line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+        # DGMS safety alerts and user notes
+        if dgms_warnings:
+            pdf.ln(5)
+            _set_font(pdf, 'B', 12)
+            pdf.cell(0, 8, 'DGMS SAFETY ALERTS:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            _set_font(pdf, '', 10)
+            pdf.multi_cell(0, 6, "\n".join(f'- {warning}' for warning in dgms_warnings), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        
+        if notes:
+            pdf.ln(5)
+            _set_font(pdf, 'B', 12)
+            pdf.cell(0, 8, 'ADDITIONAL NOTES:', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            _set_font(pdf, '', 10)
+            pdf.multi_cell(0, 6, notes, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
         # Save PDF with error handling
         try:
-            pdf.output(filename)
+            _write_pdf(pdf, filename)
             _report_logger.info(f"PDF report successfully generated: {filename}")
             return filename
         except Exception as e:
@@ -401,18 +538,35 @@ def generate_pdf_report(results, filename='reports/stope_report.pdf', notes=None
             _report_logger.error("Even fallback PDF generation failed")
             return None
 
+def generate_all_reports(results, summary_filename='reports/stope_summary.txt',
+                         pdf_filename='reports/stope_report.pdf', notes=None):
+    """
+    Generate the text summary and the PDF report concurrently.
+
+    Both reports depend only on results, so each runs on its own thread and
+    the slower PDF layout no longer waits for the summary. Threads rather
+    than processes: the PDF is mostly file and image I/O, and forking a
+    process that already runs pool threads is unsafe. Returns a tuple of
+    (summary_filename, pdf_filename) as produced by the two generators.
+    Both reports are stamped with the same generation time.
+    """
+    generated_at = datetime.now()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        summary_future = pool.submit(generate_summary_text, results, summary_filename, notes, generated_at)
+        pdf_future = pool.submit(generate_pdf_report, results, pdf_filename, notes, generated_at)
+        return summary_future.result(), pdf_future.result()
+
 def _create_fallback_pdf_report(results, filename):
     """Create a simplified PDF report when the main generation fails"""
+    from fpdf.enums import XPos, YPos
     try:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_margins(20, 20, 20)
+        pdf = _new_report_pdf()
         
-        pdf.set_font('Arial', 'B', 16)
-        pdf.cell(0, 15, 'MINING STOPE ANALYSIS REPORT', ln=True, align='C')
+        pdf.set_font('Helvetica', 'B', 16)
+        pdf.cell(0, 15, 'MINING STOPE ANALYSIS REPORT', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
         pdf.ln(10)
         
-        pdf.set_font('Arial', '', 12)
+        pdf.set_font('Helvetica', '', 12)
         
         # Basic information
         stability = results.get('stability', {})
@@ -427,33 +581,15 @@ def _create_fallback_pdf_report(results, filename):
         ]
         
         for info in basic_info:
-            pdf.multi_cell(0, 8, info)
+            pdf.multi_cell(0, 8, info, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         
-        pdf.output(filename)
+        _write_pdf(pdf, filename)
         _report_logger.info(f"Fallback PDF report created: {filename}")
         return filename
         
     except Exception as e:
         _report_logger.error(f"Fallback PDF creation failed: {e}")
         return None
-        for warning in dgms_warnings:
-            pdf.multi_cell(0, 6, f'- {warning}')
-    
-    if notes:
-        pdf.ln(5)
-        pdf.set_font('Arial', 'B', 12)
-        pdf.cell(0, 8, 'ADDITIONAL NOTES:', ln=True)
-        pdf.set_font('Arial', '', 10)
-        pdf.multi_cell(0, 6, notes)
-    
-    # Save PDF
-    try:
-        pdf.output(filename)
-        _report_logger.info(f"Successfully generated PDF report: {filename}")
-    except Exception as e:
-        _report_logger.error(f"Failed to generate PDF report: {str(e)}")
-    
-    return filename
 
 # Enhanced 3D visualization functions remain the same as in stability_analysis.py
 # to avoid duplication while maintaining functionality
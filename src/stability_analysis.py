@@ -1,15 +1,29 @@
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+# Long paths are rasterized in chunks instead of one large allocation
+matplotlib.rcParams['agg.path.chunksize'] = 10000
 import numpy as np
 import math
 import os
-from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import shutil
+import atexit
+import multiprocessing
+from matplotlib.collections import LineCollection, PatchCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Circle, Rectangle, Wedge
+# matplotlib.figure already imports mplot3d to register the '3d' projection,
+# so the art3d collections cost nothing extra here
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+from concurrent.futures import Future, ProcessPoolExecutor, wait
 import threading
 import logging
 import warnings
+from contextlib import contextmanager
+from _core_math import (
+    _dimension_core, _hoek_brown_core, _k_ratio_core, _stability_core, _stability_number_core,
+)
+from _figures import PNG_PIL_KWARGS, _ensure_dir, _new_figure
 
 # ============================================================================
 # CONSTANTS – INDIAN & INTERNATIONAL STANDARDS
@@ -21,9 +35,35 @@ CMRI_RMR_ADJUSTMENT    = 5      # CMRI adjustment for Indian RMR
 IBE_STRESS_FACTOR      = 0.028  # MPa/m vertical stress coefficient
 
 HOEK_MI_DEFAULT        = 15     # Hoek–Brown intact material constant
+# DGMS safety adjustment applied to the stope width (unitless)
+_SAFETY_ADJ            = max(0.85, min(1.0, DGMS_SAFETY_FACTOR_MIN/1.5*0.9))
 
 ENABLE_ASYNC_3D        = True
-_3D_EXECUTOR           = ThreadPoolExecutor(max_workers=1)
+# matplotlib is not thread-safe and holds the GIL while drawing, so the stope
+# views are built and drawn in worker processes. Other figures are saved by
+# the caller, so their PNGs are on disk when the call returns.
+# STABILITY_SINGLECORE=1 renders the stope views in-process too, which is
+# easier to debug.
+STABILITY_SINGLECORE   = os.environ.get('STABILITY_SINGLECORE') == '1'
+# 'vispy' renders the 3D view's solids through OpenGL when vispy and a GL
+# context are available; anything else, or a failure, uses matplotlib
+STABILITY_3D_BACKEND   = os.environ.get('STABILITY_3D_BACKEND', 'matplotlib').lower()
+# Worker pool for the stope views, started by the first render that needs it
+_VIZ_EXECUTOR          = None
+_VIZ_EXECUTOR_LOCK     = threading.Lock()
+# Claims on the cache directories being rendered or published, by directory.
+# The thread that put a claim in owns the directory until it is resolved;
+# others wait on it. wait_for_visualizations() blocks on all of them.
+_QUEUED_VIZ            = {}
+_QUEUED_VIZ_LOCK       = threading.Lock()
+
+VIZ_CACHE_DIR          = os.path.join('reports', '.cache')
+VIZ_CACHE_MAX_DESIGNS  = 20     # most recently used designs kept in VIZ_CACHE_DIR, ~750 KB each
+GEOLOGICAL_LAYERS      = 1      # layers marked below the stope in cross-sections
+SHRINKAGE_MUCK_POINTS  = 20     # broken-ore fragments drawn in shrinkage stopes
+MAX_3D_ROOMS           = 20     # room-and-pillar rooms drawn before widening them
+MAX_3D_HOLES_PER_AXIS  = 8      # VCR blastholes drawn along each side of the stope
+MAX_PLAN_LABELS        = 40     # plan-view rooms (and pillars) labelled before only the ends are
 
 MAX_PIXEL_WIDTH  = 2000
 MAX_PIXEL_HEIGHT = 1500
@@ -35,31 +75,231 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 _viz_logger = logging.getLogger('visualization')
 
+def _dpi_crop_from_env():
+    """STABILITY_DPI_CROP as a factor of at least 1; unset or invalid values give 1.0"""
+    value = os.environ.get('STABILITY_DPI_CROP', '1.0')
+    try:
+        crop = float(value)
+        if not math.isfinite(crop):
+            raise ValueError(value)
+    except ValueError:
+        _viz_logger.warning(f"Ignoring invalid STABILITY_DPI_CROP={value!r}, using 1.0")
+        return 1.0
+    return max(1.0, crop)
+
+# Crop factor for headless sweeps: STABILITY_DPI_CROP=2 saves every figure at
+# half its DPI, about a quarter of the pixels to rasterize and encode
+STABILITY_DPI_CROP = _dpi_crop_from_env()
+
 # ============================================================================
 # VISUALIZATION HELPERS
 # ============================================================================
 
 def _save_fig(fig, filepath, max_w=MAX_PIXEL_WIDTH, max_h=MAX_PIXEL_HEIGHT,
-              base_dpi=BASE_DPI, facecolor='white', edgecolor='none'):
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+              base_dpi=BASE_DPI, facecolor='white', edgecolor='none', bbox_inches=None,
+              allow_crop=False):
+    # bbox_inches='tight' renders the figure twice (measure, then draw), so it
+    # is only requested by views whose contents overflow their fixed margins
+    _ensure_dir(os.path.dirname(filepath))
     w_in, h_in = fig.get_size_inches()
     dpi_needed = min(base_dpi, max_w/w_in, max_h/h_in)
-    dpi_final = int(max(LOW_DPI, min(dpi_needed, MAX_DPI)))
+    dpi_final = int(max(LOW_DPI, min(dpi_needed, MAX_DPI)) / STABILITY_DPI_CROP)
+    if allow_crop and STABILITY_DPI_CROP > 1:
+        # Dense scenes also shrink the canvas, reducing texture size with the DPI
+        fig.set_size_inches(w_in / STABILITY_DPI_CROP, h_in / STABILITY_DPI_CROP)
+    savefig_kwargs = dict(dpi=dpi_final, bbox_inches=bbox_inches, facecolor=facecolor,
+                          edgecolor=edgecolor, pil_kwargs=PNG_PIL_KWARGS)
     _viz_logger.info(f"Saving {filepath} at {dpi_final} DPI")
+    _invalidate_output(filepath)
+    _write_figure(fig, filepath, savefig_kwargs)
+
+def _write_figure(fig, filepath, savefig_kwargs):
+    """savefig to a temporary name and rename, so readers never see a partial PNG"""
+    tmp = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
-        fig.savefig(filepath, dpi=dpi_final, bbox_inches='tight',
-                    facecolor=facecolor, edgecolor=edgecolor)
-
-def _prism_faces(vertices):
-    return [
-        [vertices[i] for i in (0,1,2,3)],
-        [vertices[i] for i in (4,5,6,7)],
-        [vertices[i] for i in (0,1,5,4)],
-        [vertices[i] for i in (1,2,6,5)],
-        [vertices[i] for i in (2,3,7,6)],
-        [vertices[i] for i in (3,0,4,7)],
-    ]
+        fig.savefig(tmp, format='png', **savefig_kwargs)
+    os.replace(tmp, filepath)
+
+def _viz_executor():
+    """Process pool for the stope views, created on first use"""
+    global _VIZ_EXECUTOR
+    with _VIZ_EXECUTOR_LOCK:
+        if _VIZ_EXECUTOR is None:
+            # Forking a process that runs other threads (the GUI's Tk loop,
+            # report threads) can copy a lock mid-acquire into the child, so
+            # workers start from a clean forkserver, or spawn where there is none
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _VIZ_EXECUTOR = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) - 1),
+                                                mp_context=multiprocessing.get_context(method))
+            atexit.register(_shutdown_viz_executor)
+        return _VIZ_EXECUTOR
+
+def _shutdown_viz_executor():
+    """Stop the view pool at interpreter exit, dropping renders not yet started"""
+    global _VIZ_EXECUTOR
+    with _VIZ_EXECUTOR_LOCK:
+        executor, _VIZ_EXECUTOR = _VIZ_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def wait_for_visualizations(timeout=None):
+    """
+    Block until stope views still rendering in the pool have finished.
+
+    Each visualization call already returns with its PNGs published, so
+    this only waits on renders started by other threads.
+    """
+    # Futures copied into a forked child never complete there
+    if multiprocessing.parent_process() is not None:
+        return
+    with _QUEUED_VIZ_LOCK:
+        claims = list(_QUEUED_VIZ.values())
+    wait(claims, timeout=timeout)
+
+def _claim_cache_dir(cache_dir):
+    """Own cache_dir for rendering or publishing, waiting while another thread does"""
+    while True:
+        with _QUEUED_VIZ_LOCK:
+            held = _QUEUED_VIZ.get(cache_dir)
+            if held is None:
+                claim = _QUEUED_VIZ[cache_dir] = Future()
+                return claim
+        # Once released, the cache is either complete or rendered again by
+        # whichever thread claims it next
+        wait([held])
+
+def _release_cache_dir(cache_dir, claim):
+    with _QUEUED_VIZ_LOCK:
+        del _QUEUED_VIZ[cache_dir]
+    claim.set_result(None)
+
+# One reusable Figure per view. Clearing and redrawing keeps the Agg canvas
+# instead of allocating a new pixel buffer per render, and separate figures
+# let different views be built concurrently without waiting on each other.
+_SHARED_FIGURES = {}
+_SHARED_FIGURES_LOCK = threading.Lock()
+
+@contextmanager
+def _shared_figure(view, figsize):
+    """Cleared shared Figure of the given view, held exclusively for the block"""
+    with _SHARED_FIGURES_LOCK:
+        if view not in _SHARED_FIGURES:
+            _SHARED_FIGURES[view] = (threading.Lock(), _new_figure(figsize))
+        lock, fig = _SHARED_FIGURES[view]
+    with lock:
+        fig.set_size_inches(figsize)
+        try:
+            yield fig
+        finally:
+            # Drop the artists as soon as the view is saved; only the empty
+            # figure and its canvas are kept
+            fig.clear()
+
+# Charts whose layout never changes are built once per process as templates;
+# later calls only swap the data-dependent artists before saving
+_TEMPLATES = {}
+
+@contextmanager
+def _template_figure(key, build):
+    """(figure, handles) made once by build(), held exclusively for the block"""
+    with _SHARED_FIGURES_LOCK:
+        if key not in _TEMPLATES:
+            _TEMPLATES[key] = (threading.Lock(), *build())
+        lock, fig, handles = _TEMPLATES[key]
+    with lock:
+        yield fig, handles
+
+def _viz_cache_key(args):
+    """Content hash of the values that determine the stope visualizations"""
+    return hashlib.blake2b(repr(args).encode(), digest_size=16).hexdigest()
+
+# Each rendered output has a sidecar reports/.hashes/<name>.txt holding the
+# hash of the inputs it was drawn from, so an identical re-run skips the draw
+def _sidecar_path(target):
+    directory, name = os.path.split(target)
+    return os.path.join(directory, '.hashes', f"{name}.txt")
+
+def _render_is_current(target, key, outputs):
+    """True when the outputs exist and target's sidecar records the input hash key"""
+    try:
+        with open(_sidecar_path(target)) as f:
+            if f.read() != key:
+                return False
+    except OSError:
+        return False
+    return all(os.path.exists(output) for output in outputs)
+
+def _forget_render(target):
+    """Drop target's sidecar before its outputs change, so no old hash claims them"""
+    try:
+        os.remove(_sidecar_path(target))
+    except OSError:
+        pass
+
+def _invalidate_output(filepath):
+    """Drop every sidecar vouching for filepath, which is about to be overwritten"""
+    _forget_render(filepath)
+    directory, name = os.path.split(filepath)
+    if directory == 'reports' and name in _VIZ_FILES:
+        _forget_render(_PUBLISHED_VIZ)
+
+def _record_render(target, key):
+    """Store key as the sidecar of target's freshly written outputs"""
+    sidecar = _sidecar_path(target)
+    _ensure_dir(os.path.dirname(sidecar))
+    with open(sidecar, 'w') as f:
+        f.write(key)
+
+def _publish_viz(cache_dir, filename):
+    """Hardlink a cached PNG into reports/, copying where links are unsupported"""
+    src = os.path.join(cache_dir, filename)
+    dst = os.path.join('reports', filename)
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    _invalidate_output(dst)
+    try:
+        if os.path.samefile(src, dst):
+            # Already linked; renaming a link over another link to the same
+            # file is a no-op that would leave tmp behind
+            os.utime(dst)
+            return
+    except OSError:
+        pass
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    # Refresh the mtime so copies derived from the previous design are rebuilt
+    os.utime(tmp)
+    os.replace(tmp, dst)
+
+# Vertex indices of the six quad faces of a box given as 8 corners,
+# bottom four (counter-clockwise) followed by the top four
+_PRISM_FACE_IDX = np.array([
+    [0, 1, 2, 3],
+    [4, 5, 6, 7],
+    [0, 1, 5, 4],
+    [1, 2, 6, 5],
+    [2, 3, 7, 6],
+    [3, 0, 4, 7],
+])
+
+def _box_vertices(x0, x1, y0, y1, z0, z1):
+    """
+    Corners of axis-aligned boxes as an (N, 8, 3) float32 array.
+
+    Bounds may be scalars or equal-length arrays, so a row of rooms or a stack
+    of slices is built in one call. Corner order matches _PRISM_FACE_IDX.
+    """
+    x0, x1, y0, y1, z0, z1 = np.broadcast_arrays(*np.atleast_1d(x0, x1, y0, y1, z0, z1))
+    xs = np.stack([x0, x1, x1, x0, x0, x1, x1, x0], axis=-1)
+    ys = np.stack([y0, y0, y1, y1, y0, y0, y1, y1], axis=-1)
+    zs = np.stack([z0, z0, z0, z0, z1, z1, z1, z1], axis=-1)
+    return np.stack([xs, ys, zs], axis=-1).astype(np.float32)
+
+def _box_faces(x0, x1, y0, y1, z0, z1):
+    """Quad faces of the boxes as an (N*6, 4, 3) array, gathered in one indexing op"""
+    return _box_vertices(x0, x1, y0, y1, z0, z1)[:, _PRISM_FACE_IDX].reshape(-1, 4, 3)
 
 # ============================================================================
 # GEOTECHNICAL FORMULAE
@@ -96,20 +336,13 @@ def calculate_rmr_standard(rqd, q_params=None):
 def calculate_stability_number_standard(q_val, dip, depth):
     """N' = Q * A * B * C"""
     # Depth Adjustment Factor (A): 1.0 if depth > 500, else 0.85
-    a = 1.0 if depth > 500 else 0.85
     # Orientation Factor (B): range 0.3 to 0.7
-    b = max(0.3, min(0.7, 0.3 + (dip-20)/70))
-    # Gravity Factor (C): 1 - cos(theta)
-    c = 1 - math.cos(math.radians(dip))
-    return q_val * a * b * c
+    # Gravity Factor (C): 1 - cos(theta), tabulated for integral dips
+    return _stability_number_core(q_val, dip, depth)
 
 def calculate_horizontal_k_ratio_standard(depth):
     """Brown-Hoek k-ratio decreases with depth"""
-    if depth<300:
-        k=1.5
-    else:
-        k=0.65 + 1350/(depth+200)
-    return min(2.0, max(0.5, k))
+    return _k_ratio_core(depth)
 
 def calculate_ucs_from_rqd_standard(rqd):
     """UCS = 20 + 0.8 * RQD (MPa)"""
@@ -121,17 +354,20 @@ def calculate_gsi_from_rqd_standard(rqd):
 
 def calculate_hoek_brown_strength_standard(rqd):
     """Unconfined rock mass strength σcm = σci * s^a"""
-    sigma_ci = calculate_ucs_from_rqd_standard(rqd)
-    gsi      = calculate_gsi_from_rqd_standard(rqd)
-    # Hoek-Brown disturbance factor D is assumed 0 (undisturbed rock mass)
-    HOEK_D_FACTOR = 0  # If D is to be used, update accordingly
-    mb       = HOEK_MI_DEFAULT * math.exp((gsi-100)/28) * (1 - HOEK_D_FACTOR)
-    s        = math.exp((gsi-100)/9) * (1 - HOEK_D_FACTOR)
-    a        = 0.5 + (1/6)*(math.exp(-gsi/15)-math.exp(-20/3))
-    return sigma_ci * (s**a)
+    # Hoek-Brown disturbance factor D is assumed 0 (undisturbed rock mass);
+    # the arithmetic lives in _core_math so it can be JIT-compiled
+    return _hoek_brown_core(rqd)
+
+def _hr_batch(n_prime):
+    """Branch-free Mathews-Potvin hydraulic radius over an array of N'"""
+    return np.where(n_prime <= 3, 2.5 + 0.5*n_prime,
+                    np.where(n_prime <= 10, 4.0 + 0.8*n_prime,
+                             7.0 + 5.0*np.log10(np.maximum(n_prime, 1e-9))))
 
 def calculate_hydraulic_radius_design(n_prime):
-    """Mathews-Potvin piecewise hydraulic radius"""
+    """Mathews-Potvin piecewise hydraulic radius; arrays are evaluated in one pass"""
+    if np.ndim(n_prime):
+        return _hr_batch(np.asarray(n_prime, dtype=float))
     if n_prime<=3:    return 2.5 + 0.5*n_prime
     if n_prime<=10:   return 4.0 + 0.8*n_prime
     return 7.0 + 5.0*math.log10(n_prime)
@@ -140,29 +376,27 @@ def calculate_hydraulic_radius_design(n_prime):
 # MAIN CALCULATION FUNCTIONS
 # ============================================================================
 
-def determine_stope_type(inputs):
-    dip   = inputs['dip_angle']
-    rqd   = inputs['rqd']
-    depth = inputs.get('mining_depth', 300)
-
-    # 1. Vertical Crater Retreat
-    if dip > 60 and rqd >= 75 and depth < 800:
-        return "Vertical Crater Retreat"
-    # 2. Sublevel Stoping
-    if 45 < dip <= 60 and rqd >= 75:
-        return "Sublevel Stoping"
-    # 3. Cut-and-Fill
-    if 30 < dip <= 45 and rqd >= 60:
-        return "Cut-and-Fill"
-    # 4. Room-and-Pillar
-    if dip <= 30 and rqd >= 50:
-        return "Room-and-Pillar"
-    # 5. Shrinkage Stoping
-    if dip > 50 and rqd >= 40:
-        return "Shrinkage Stoping"
-    # 6. Default fallback
+# Mining method selection, checked in order; the first rule met wins:
+# (method, dip above, dip up to, minimum RQD, depth below)
+_STOPE_TYPE_RULES = (
+    ("Vertical Crater Retreat", 60,          math.inf, 75, 800),
+    ("Sublevel Stoping",        45,          60,       75, math.inf),
+    ("Cut-and-Fill",            30,          45,       60, math.inf),
+    ("Room-and-Pillar",         -math.inf,   30,       50, math.inf),
+    ("Shrinkage Stoping",       50,          math.inf, 40, math.inf),
+)
+
+def _classify(dip, rqd, depth):
+    """Mining method for the given dip, RQD and depth"""
+    for stope_type, dip_above, dip_max, rqd_min, depth_below in _STOPE_TYPE_RULES:
+        if dip_above < dip <= dip_max and rqd >= rqd_min and depth < depth_below:
+            return stope_type
+    # Default fallback
     return "Shrinkage Stoping"
 
+def determine_stope_type(inputs):
+    return _classify(inputs['dip_angle'], inputs['rqd'], inputs.get('mining_depth', 300))
+
 def calculate_stope_dimensions(inputs):
     """
     Standards‐compliant stope dimension calculation:
@@ -174,7 +408,7 @@ def calculate_stope_dimensions(inputs):
     rqd           = max(0, min(100, inputs['rqd']))
     dip_angle     = inputs['dip_angle']
     depth         = inputs.get('mining_depth', 300)
-    stope_type    = determine_stope_type(inputs)
+    stope_type    = _classify(dip_angle, inputs['rqd'], depth)
 
     # Extract Q-system parameters from inputs
     q_params = {}
@@ -183,27 +417,20 @@ def calculate_stope_dimensions(inputs):
         if param in inputs:
             q_params[param] = inputs[param]
 
-    # Classification indices
-    rmr           = calculate_rmr_standard(rqd, q_params if q_params else None)
+    # Classification indices and design hydraulic radius (Mathews–Potvin)
     q_value       = calculate_q_standard(rqd, q_params if q_params else None)
-    n_prime       = calculate_stability_number_standard(q_value, dip_angle, depth)
-
-    # Design hydraulic radius (Mathews–Potvin)
-    hr_design     = calculate_hydraulic_radius_design(n_prime)
+    # The core takes log10(Q): plain Python raises on Q <= 0 but the compiled
+    # core returns -inf or NaN, so both paths are stopped here the same way
+    if not q_value > 0:
+        raise ValueError(f"Q value must be positive, got {q_value}. Check RQD and the Q-system parameters.")
+    rmr, n_prime, hr_design = _dimension_core(q_value, dip_angle, depth)
 
     # Width from stability and DGMS minimum
     width_raw     = max(DGMS_PILLAR_WIDTH_MIN, 2.0 * hr_design)
 
-    # Corrected: Length = 10 × Width
-    length_raw    = width_raw * 10
-
-    # Corrected: Height = 0.8 × Width
-    height_raw    = width_raw * 0.8
-
     # Apply DGMS safety adjustment on width
-    safety_adj    = max(0.85, min(1.0, DGMS_SAFETY_FACTOR_MIN/1.5*0.9))
-    width         = round(width_raw * safety_adj, 2)
-    # Use adjusted width for both length and height
+    width         = round(width_raw * _SAFETY_ADJ, 2)
+    # Length = 10 × Width and Height = 0.8 × Width, from the adjusted width
     length        = round(width * 10, 2)
     height        = round(width * 0.8, 2)
 
@@ -229,15 +456,9 @@ def assess_stability(inputs, dims):
     rqd     = max(0, min(100, inputs['rqd']))
     ore_t   = max(0.1, inputs.get('ore_thickness',1))
 
-    # Calculate stresses using IBE and Brown-Hoek formulas
-    sig_v   = depth * IBE_STRESS_FACTOR
-    k_ratio = calculate_horizontal_k_ratio_standard(depth)
-    sig_h   = sig_v * k_ratio
-
-    # Compute rock mass strength per Hoek-Brown criterion
-    rock_s  = calculate_hoek_brown_strength_standard(rqd)
-    # Apply empirical ore thickness adjustment (empirical factor)
-    rock_s *= (1 + 0.015*math.log(ore_t+1))
+    # IBE/Brown-Hoek stresses and Hoek-Brown rock mass strength with the
+    # empirical ore thickness adjustment
+    sig_v, k_ratio, sig_h, rock_s = _stability_core(depth, rqd, ore_t, IBE_STRESS_FACTOR)
 
     sf      = round(rock_s/sig_v,2)
     if sf< DGMS_SAFETY_FACTOR_MIN: cls="Unstable (<DGMS)"
@@ -245,7 +466,8 @@ def assess_stability(inputs, dims):
     elif sf<2.5:                  cls="Stable"
     else:                         cls="Highly Stable"
 
-    generate_enhanced_stope_visualizations(dims, inputs, sf, sig_v, sig_h, rock_s)
+    # Visualizations are generated once by the caller (calculate_stope_design)
+    # from the reported values, not here as well
     return {
         'safety_factor': sf,
         'stability_class': cls,
@@ -256,549 +478,895 @@ def assess_stability(inputs, dims):
         'dgms_compliant': sf>=DGMS_SAFETY_FACTOR_MIN
     }
 
+# ============================================================================
+# BATCH EVALUATION FOR PARAMETER SWEEPS
+# ============================================================================
+# NumPy versions of the scalar formulae, one array operation per step over a
+# whole grid of inputs. Elementwise they perform the same operations as the
+# scalar path; only the exp/log implementations may differ in the last bit.
+
+_STABILITY_CLASSES = np.array(["Unstable (<DGMS)", "Marginal", "Stable", "Highly Stable"])
+_STABILITY_CLASS_BOUNDS = np.array([DGMS_SAFETY_FACTOR_MIN, 2.0, 2.5])
+# Methods of _STOPE_TYPE_RULES by index, then the fallback
+_STOPE_TYPE_NAMES = np.array([rule[0] for rule in _STOPE_TYPE_RULES] + ["Shrinkage Stoping"])
+
+def _k_ratio_batch(depth):
+    """Vectorized calculate_horizontal_k_ratio_standard"""
+    return np.clip(np.where(depth < 300, 1.5, 0.65 + 1350/(depth+200)), 0.5, 2.0)
+
+def _hoek_brown_batch(rqd):
+    """Vectorized calculate_hoek_brown_strength_standard"""
+    sigma_ci = 20 + 0.8*rqd
+    gsi      = np.clip(rqd-15, 20, 85)
+    # Both exponentials in one np.exp call over the stacked arguments
+    s, exp_a = np.exp(np.stack([(gsi-100)/9, -gsi/15]))
+    a        = 0.5 + (1/6)*(exp_a-math.exp(-20/3))
+    return sigma_ci * (s**a)
+
+def determine_stope_type_batch(dip, rqd, depth=300):
+    """
+    determine_stope_type over arrays of dip, RQD and depth.
+
+    The rules of _STOPE_TYPE_RULES are applied with np.select in the same
+    order, so every element gets the method the scalar classifier gives.
+    """
+    dip, rqd, depth = np.broadcast_arrays(np.asarray(dip, dtype=float),
+                                          np.asarray(rqd, dtype=float),
+                                          np.asarray(depth, dtype=float))
+    conditions = [(dip_above < dip) & (dip <= dip_max) & (rqd >= rqd_min) & (depth < depth_below)
+                  for _, dip_above, dip_max, rqd_min, depth_below in _STOPE_TYPE_RULES]
+    codes = np.select(conditions, np.arange(len(_STOPE_TYPE_RULES)), default=len(_STOPE_TYPE_RULES))
+    return _STOPE_TYPE_NAMES[codes]
+
+def assess_stability_batch(rqd, depth, ore_thickness=1):
+    """
+    assess_stability over arrays of RQD, depth and ore thickness.
+
+    The inputs broadcast against each other, so an RQD x depth grid from
+    np.meshgrid is evaluated in one pass. Returns a dict with the keys of
+    assess_stability holding arrays, plus the broadcast 'depth', so the
+    result can go straight to plot_stability_analysis; no visualizations
+    are generated.
+    """
+    depth = np.maximum(0.1, np.asarray(depth, dtype=float))
+    rqd   = np.clip(np.asarray(rqd, dtype=float), 0, 100)
+    ore_t = np.maximum(0.1, np.asarray(ore_thickness, dtype=float))
+    depth, rqd, ore_t = np.broadcast_arrays(depth, rqd, ore_t)
+
+    sig_v   = depth * IBE_STRESS_FACTOR
+    k_ratio = _k_ratio_batch(depth)
+    sig_h   = sig_v * k_ratio
+    rock_s  = _hoek_brown_batch(rqd) * (1 + 0.015*np.log(ore_t+1))
+
+    sf = np.round(rock_s/sig_v, 2)
+    return {
+        'safety_factor': sf,
+        'stability_class': _STABILITY_CLASSES[np.searchsorted(_STABILITY_CLASS_BOUNDS, sf, side='right')],
+        'vertical_stress': np.round(sig_v, 2),
+        'horizontal_stress': np.round(sig_h, 2),
+        'k_ratio': np.round(k_ratio, 2),
+        'rock_strength': np.round(rock_s, 2),
+        'dgms_compliant': sf >= DGMS_SAFETY_FACTOR_MIN,
+        'depth': depth
+    }
+
 # ============================================================================
 # VISUALIZATION FUNCTIONS
 # ============================================================================
 
+_VIZ_FILES = (
+    'stope_3d_isometric.png',
+    'stope_cross_sections.png',
+    'stope_plan_view.png',
+    'safety_factor_gauge.png',
+    'stress_strength_comparison.png'
+)
+# Sidecar target recording which design the published _VIZ_FILES show
+_PUBLISHED_VIZ = os.path.join('reports', 'stope_visualizations')
+
+def _outputs_newer_than(outputs, mtime):
+    """True when every output exists and was last modified no earlier than mtime"""
+    try:
+        return all(os.path.getmtime(output) >= mtime for output in outputs)
+    except OSError:
+        return False
+
 def generate_enhanced_stope_visualizations(dimensions, inputs, safety_factor,
                                            vertical_stress, horizontal_stress,
-                                           rock_strength):
-    os.makedirs('reports', exist_ok=True)
-    stope_type = dimensions.get('stope_type', determine_stope_type(inputs))
+                                           rock_strength, source_mtime=None):
+    _ensure_dir('reports')
+    outputs = [os.path.join('reports', f) for f in _VIZ_FILES]
+    # Callers regenerating from an input file pass its mtime; outputs written
+    # since that file last changed are kept without hashing the design
+    if source_mtime is not None and _outputs_newer_than(outputs, source_mtime):
+        _viz_logger.info("Visualizations in reports/ are newer than their source")
+        return
+    stope_type = dimensions.get('stope_type') or determine_stope_type(inputs)
     w, h, L = dimensions['width'], dimensions['height'], dimensions['length']
     d = inputs.get('mining_depth',300)
 
-    if ENABLE_ASYNC_3D:
+    # Renders are cached under reports/.cache/<key>/ so unchanged designs
+    # only relink the existing PNGs instead of going through matplotlib again.
+    # The 3D backend and the DPI crop are part of the key: they change the
+    # views' pixels.
+    key = _viz_cache_key((
+        w, h, L, d, stope_type, inputs.get('ore_thickness', 1),
+        safety_factor, vertical_stress, horizontal_stress, rock_strength,
+        STABILITY_3D_BACKEND, STABILITY_DPI_CROP
+    ))
+    published = _PUBLISHED_VIZ
+    if _render_is_current(published, key, outputs):
+        _viz_logger.info("Visualizations in reports/ already match this design")
+        return
+    cache_dir = os.path.join(VIZ_CACHE_DIR, key)
+    claim = _claim_cache_dir(cache_dir)
+    try:
+        _render_to_cache(cache_dir, key, w, h, L, d, stope_type, inputs, safety_factor,
+                         vertical_stress, horizontal_stress, rock_strength)
+        # Marks the design as used for prune_visualization_cache()
+        os.utime(cache_dir)
+    finally:
+        _release_cache_dir(cache_dir, claim)
+    prune_visualization_cache()
+
+def prune_visualization_cache(keep=None):
+    """
+    Delete all but the `keep` most recently used designs from VIZ_CACHE_DIR
+    (VIZ_CACHE_MAX_DESIGNS by default). Designs being rendered or published
+    are skipped. Views already published to reports/ are hardlinks or
+    copies, so they are not affected.
+    """
+    if keep is None:
+        keep = VIZ_CACHE_MAX_DESIGNS
+    used = []
+    try:
+        with os.scandir(VIZ_CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    used.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+    used.sort(reverse=True)
+    for _, cache_dir in used[keep:]:
+        with _QUEUED_VIZ_LOCK:
+            if cache_dir in _QUEUED_VIZ:
+                continue
+            # Held like a render claim, so no thread publishes from it while
+            # it is deleted
+            claim = _QUEUED_VIZ[cache_dir] = Future()
+        try:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        finally:
+            _release_cache_dir(cache_dir, claim)
+
+def _render_to_cache(cache_dir, key, w, h, L, d, stope_type, inputs, safety_factor,
+                     vertical_stress, horizontal_stress, rock_strength):
+    """Publish the design's views from cache_dir, rendering them there first if needed"""
+    published = _PUBLISHED_VIZ
+    if all(os.path.exists(os.path.join(cache_dir, f)) for f in _VIZ_FILES):
+        _viz_logger.info(f"Reusing cached visualizations from {cache_dir}")
+        for filename in _VIZ_FILES:
+            _publish_viz(cache_dir, filename)
+        _record_render(published, key)
+        return
+    _forget_render(published)
+    # Not _ensure_dir: this process or a pool worker may have recorded the
+    # directory as created before prune_visualization_cache() deleted it
+    os.makedirs(os.path.join(cache_dir, '.hashes'), exist_ok=True)
+
+    if ENABLE_ASYNC_3D and not STABILITY_SINGLECORE:
         _viz_logger.info("Starting async 3D visualization rendering...")
-        _3D_EXECUTOR.submit(_generate_3d_isometric_view, w, h, L, d, stope_type)
+        render_3d = _viz_executor().submit(_generate_3d_isometric_view, w, h, L, d, stope_type, cache_dir)
     else:
-        create_3d_isometric_view(w, h, L, d, stope_type)
-
-    create_cross_section_view(w, h, L, d, stope_type, inputs)
-    create_plan_view(w, L, stope_type, inputs)
-    generate_safety_factor_gauge(safety_factor)
-    create_stress_analysis_chart(vertical_stress, horizontal_stress, rock_strength)
-
-def _generate_3d_isometric_view(width, height, length, depth, stope_type):
+        create_3d_isometric_view(w, h, L, d, stope_type, output_dir=cache_dir)
+        _publish_viz(cache_dir, 'stope_3d_isometric.png')
+        render_3d = None
+
+    views = (
+        (create_cross_section_view, (w, h, L, d, stope_type, inputs)),
+        (create_plan_view, (w, L, stope_type, inputs)),
+        (generate_safety_factor_gauge, (safety_factor,)),
+        (create_stress_analysis_chart, (vertical_stress, horizontal_stress, rock_strength)),
+    )
+    if STABILITY_SINGLECORE:
+        saves = [view(*args, output_dir=cache_dir) for view, args in views]
+    else:
+        # Each view is built, drawn and encoded in the pool, so the caller
+        # neither builds the figures nor pickles them
+        pool = _viz_executor()
+        saves = [pool.submit(view, *args, output_dir=cache_dir) for view, args in views]
+
+    # The views render in parallel, but this returns only once all of them
+    # are published, so callers such as the GUI can read reports/ right away
+    complete = render_3d is None or render_3d.result()
+    for filename, saved in zip(_VIZ_FILES[1:], saves):
+        try:
+            if saved is not None:
+                saved.result()
+            _publish_viz(cache_dir, filename)
+        except Exception as e:
+            _viz_logger.error(f"Error saving {filename}: {e}")
+            complete = False
+    # Outputs that failed to render must not be recorded as matching the design
+    if complete:
+        _record_render(published, key)
+
+def _generate_3d_isometric_view(width, height, length, depth, stope_type, output_dir='reports'):
     """Background worker function for 3D rendering"""
     try:
         _viz_logger.info(f"Starting 3D isometric view generation for {stope_type}...")
-        create_3d_isometric_view(width, height, length, depth, stope_type)
+        create_3d_isometric_view(width, height, length, depth, stope_type, output_dir=output_dir)
+        if output_dir != 'reports':
+            _publish_viz(output_dir, 'stope_3d_isometric.png')
         _viz_logger.info("3D isometric view completed successfully")
+        return True
     except Exception as e:
         _viz_logger.error(f"Error in 3D visualization: {e}")
+        return False
+
+# Colors for the different rock types in the 3D view
+ORE_COLOR     = '#FFD700'  # Gold
+WASTE_COLOR   = '#8B7355'  # Brown
+SUPPORT_COLOR = '#708090'  # Gray
 
-def create_3d_isometric_view(width, height, length, depth, stope_type):
+def create_3d_isometric_view(width, height, length, depth, stope_type, output_dir='reports'):
     """Create realistic 3D isometric view of the stope"""
-    fig = plt.figure(figsize=(14, 10))
-    ax = fig.add_subplot(111, projection='3d')
+    if STABILITY_3D_BACKEND == 'vispy':
+        filepath = os.path.join(output_dir, 'stope_3d_isometric.png')
+        try:
+            _render_3d_vispy(width, height, length, stope_type, filepath)
+            return None
+        except Exception as e:
+            _viz_logger.warning(f"vispy 3D rendering unavailable, using matplotlib: {e}")
+
+    with _shared_figure('stope_3d_isometric', (14, 10)) as fig:
+        # Margins come from subplots_adjust below, not a layout solver
+        fig.set_layout_engine('none')
+        ax = fig.add_subplot(111, projection='3d')
+        # Collections still extend the data limits as they are added, but the
+        # view limits are recomputed once after the scene is built instead of
+        # after every add_collection3d
+        ax.set_autoscale_on(False)
     
-    # Define colors for different rock types
-    ore_color = '#FFD700'  # Gold
-    waste_color = '#8B7355'  # Brown
-    support_color = '#708090'  # Gray
+        # Colors for the different rock types
+        ore_color = ORE_COLOR
+        waste_color = WASTE_COLOR
+        support_color = SUPPORT_COLOR
     
-    if stope_type == "Sublevel Stoping":
-        create_sublevel_stoping_3d(ax, width, height, length, depth, ore_color, waste_color)
-    elif stope_type == "Room-and-Pillar":
-        create_room_pillar_3d(ax, width, height, length, depth, ore_color, support_color)
-    elif stope_type == "Cut-and-Fill":
-        create_cut_fill_3d(ax, width, height, length, depth, ore_color, waste_color)
-    elif stope_type == "Shrinkage Stoping":
-        create_shrinkage_3d(ax, width, height, length, depth, ore_color)
-    elif stope_type == "Vertical Crater Retreat":
-        create_vcr_3d(ax, width, height, length, depth, ore_color)
+        if stope_type == "Sublevel Stoping":
+            create_sublevel_stoping_3d(ax, width, height, length, depth, ore_color, waste_color)
+        elif stope_type == "Room-and-Pillar":
+            create_room_pillar_3d(ax, width, height, length, depth, ore_color, support_color)
+        elif stope_type == "Cut-and-Fill":
+            create_cut_fill_3d(ax, width, height, length, depth, ore_color, waste_color)
+        elif stope_type == "Shrinkage Stoping":
+            create_shrinkage_3d(ax, width, height, length, depth, ore_color)
+        elif stope_type == "Vertical Crater Retreat":
+            create_vcr_3d(ax, width, height, length, depth, ore_color)
     
-    # Add underground context
-    add_underground_infrastructure(ax, width, height, length, depth)
+        # Add underground context
+        add_underground_infrastructure(ax, width, height, length, depth)
+        ax.set_autoscale_on(True)
+        ax.autoscale_view()
     
-    # Set labels and title
-    ax.set_xlabel('Length (m)', fontsize=10)
-    ax.set_ylabel('Width (m)', fontsize=10)
-    ax.set_zlabel('Height (m)', fontsize=10)
-    ax.set_title(f'{stope_type} - 3D Isometric View\nDepth: {depth}m | Dimensions: {length}×{width}×{height}m', 
-                fontsize=12, fontweight='bold')
+        # Set labels and title
+        ax.set_xlabel('Length (m)', fontsize=10)
+        ax.set_ylabel('Width (m)', fontsize=10)
+        ax.set_zlabel('Height (m)', fontsize=10)
+        ax.set_title(f'{stope_type} - 3D Isometric View\nDepth: {depth}m | Dimensions: {length}×{width}×{height}m', 
+                    fontsize=12, fontweight='bold')
     
-    # Add depth reference
-    ax.text2D(0.02, 0.98, f'Mining Depth: {depth}m below surface', 
-              transform=ax.transAxes, fontsize=10, 
-              bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
-              verticalalignment='top')
+        # Add depth reference
+        ax.text2D(0.02, 0.98, f'Mining Depth: {depth}m below surface', 
+                  transform=ax.transAxes, fontsize=10, 
+                  bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow", alpha=0.7),
+                  verticalalignment='top')
     
-    # Set viewing angle for best perspective
-    ax.view_init(elev=20, azim=45)
+        # Set viewing angle for best perspective
+        ax.view_init(elev=20, azim=45)
     
-    # Don't use tight_layout for 3D plots as it can cause warnings
-    # Instead, adjust the figure dimensions as needed
-    fig.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
+        # Don't use tight_layout for 3D plots as it can cause warnings
+        # Instead, adjust the figure dimensions as needed
+        fig.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)
     
-    # Use adaptive DPI for 3D renders
-    _save_fig(fig, 'reports/stope_3d_isometric.png', base_dpi=200)
-    plt.close()
+        # Scene geometry is marked rasterized so vector outputs embed it as an
+        # image while labels and the legend stay vector; the pixel caps in
+        # _save_fig already hold a 14x10in PNG below 150 DPI
+        return _save_fig(fig, os.path.join(output_dir, 'stope_3d_isometric.png'), base_dpi=BASE_DPI,
+                         allow_crop=True)
 
 def create_sublevel_stoping_3d(ax, width, height, length, depth, ore_color, waste_color):
     """Create 3D representation of sublevel stoping"""
-    vertices = [
-        [0, 0, 0], [length, 0, 0], [length, width, 0], [0, width, 0],
-        [0, 0, height], [length, 0, height], [length, width, height], [0, width, height]
-    ]
-    faces = _prism_faces(vertices)
+    faces = _box_faces(0, length, 0, width, 0, height)
     sublevel_height = min(15, height/3)
     num_sublevels = int(height / sublevel_height)
-    for i in range(1, num_sublevels):
-        z = i * sublevel_height
-        bench_x = [0, length, length, 0, 0]
-        bench_y = [width*0.1, width*0.1, width*0.9, width*0.9, width*0.1]
-        bench_z = [z, z, z, z, z]
-        ax.plot(bench_x, bench_y, bench_z, 'r-', linewidth=2, alpha=0.8)
-    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6))
-
-def create_room_pillar_3d(ax, width, height, length, depth, ore_color, support_color):
-    """Create 3D representation of room and pillar mining"""
+    # Bench outlines of every sublevel as one collection of closed rectangles
+    bench_z = np.arange(1, num_sublevels) * sublevel_height
+    if bench_z.size:
+        outline = np.array([
+            [0, width*0.1], [length, width*0.1], [length, width*0.9], [0, width*0.9], [0, width*0.1]
+        ])
+        rings = np.concatenate([np.broadcast_to(outline, (bench_z.size, 5, 2)),
+                                np.broadcast_to(bench_z[:, None, None], (bench_z.size, 5, 1))], axis=-1)
+        ax.add_collection3d(Line3DCollection(rings, colors='red', linewidths=2, alpha=0.8, rasterized=True))
+    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6, rasterized=True))
+
+def _room_pillar_spans(width, length):
+    """Start and end along the stope length of the rooms and of the pillars"""
     pillar_width = max(3, width * 0.4)
     room_width = width - pillar_width
     num_rooms = max(1, int(length / (room_width + pillar_width)))
-    for i in range(num_rooms):
-        x_start = i * (room_width + pillar_width)
-        x_end = x_start + room_width
-        if x_end <= length:
-            room_vertices = [
-                [x_start, 0, 0], [x_end, 0, 0], [x_end, width, 0], [x_start, width, 0],
-                [x_start, 0, height], [x_end, 0, height], [x_end, width, height], [x_start, width, height]
-            ]
-            room_faces = _prism_faces(room_vertices)
-            ax.add_collection3d(Poly3DCollection(room_faces, facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6))
-        if i < num_rooms - 1:
-            pillar_start = x_end
-            pillar_end = pillar_start + pillar_width
-            if pillar_end <= length:
-                pillar_vertices = [
-                    [pillar_start, 0, 0], [pillar_end, 0, 0], [pillar_end, width, 0], [pillar_start, width, 0],
-                    [pillar_start, 0, height], [pillar_end, 0, height], [pillar_end, width, height], [pillar_start, width, height]
-                ]
-                pillar_faces = _prism_faces(pillar_vertices)
-                ax.add_collection3d(Poly3DCollection(pillar_faces, facecolors=support_color, edgecolors='black', alpha=0.8, linewidths=0.6))
+    if num_rooms > MAX_3D_ROOMS:
+        # Level of detail: draw fewer, wider rooms that still span the stope
+        num_rooms = MAX_3D_ROOMS
+        room_width = length / num_rooms - pillar_width
+    x_start = np.arange(num_rooms) * (room_width + pillar_width)
+    x_end = x_start + room_width
+    rooms = x_end <= length
+    pillar_start = x_end[:-1]
+    pillar_end = pillar_start + pillar_width
+    pillars = pillar_end <= length
+    return (x_start[rooms], x_end[rooms]), (pillar_start[pillars], pillar_end[pillars])
 
-def create_cut_fill_3d(ax, width, height, length, depth, ore_color, waste_color):
-    """3-D representation of cut-and-fill stoping"""
+def create_room_pillar_3d(ax, width, height, length, depth, ore_color, support_color):
+    """Create 3D representation of room and pillar mining"""
+    (rooms_x0, rooms_x1), (pillars_x0, pillars_x1) = _room_pillar_spans(width, length)
+    # All rooms and all pillars go into one collection each
+    if rooms_x0.size:
+        ax.add_collection3d(Poly3DCollection(_box_faces(rooms_x0, rooms_x1, 0, width, 0, height),
+                                             facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6, rasterized=True))
+    if pillars_x0.size:
+        ax.add_collection3d(Poly3DCollection(_box_faces(pillars_x0, pillars_x1, 0, width, 0, height),
+                                             facecolors=support_color, edgecolors='black', alpha=0.8, linewidths=0.6, rasterized=True))
+
+def _cut_fill_slices(height):
+    """Bottom and top elevations of the cut-and-fill slices"""
     slice_height = max(2, height / 6)
     num_slices   = int(math.ceil(height / slice_height))
-    for i in range(num_slices):
-        z_bottom = i * slice_height
-        z_top    = min(height, z_bottom + slice_height * 0.7)
-        slice_vertices = [
-            [0,      0,      z_bottom],
-            [length, 0,      z_bottom],
-            [length, width,  z_bottom],
-            [0,      width,  z_bottom],
-            [0,      0,      z_top],
-            [length, 0,      z_top],
-            [length, width,  z_top],
-            [0,      width,  z_top]
-        ]
-        slice_faces = _prism_faces(slice_vertices)
-        face_colour = ore_color if i % 2 == 0 else waste_color
-        ax.add_collection3d(
-            Poly3DCollection(slice_faces, facecolors=face_colour, edgecolors='black', linewidths=0.6, alpha=0.7)
-        )
+    z_bottom = np.arange(num_slices) * slice_height
+    return z_bottom, np.minimum(height, z_bottom + slice_height * 0.7)
+
+def create_cut_fill_3d(ax, width, height, length, depth, ore_color, waste_color):
+    """3-D representation of cut-and-fill stoping"""
+    z_bottom, z_top = _cut_fill_slices(height)
+    num_slices = z_bottom.size
+    slice_faces = _box_faces(0, length, 0, width, z_bottom, z_top)
+    # Slices alternate ore and fill; each slice contributes six faces
+    face_colours = np.repeat(np.where(np.arange(num_slices) % 2 == 0, ore_color, waste_color), 6)
+    ax.add_collection3d(
+        Poly3DCollection(slice_faces,
+                         facecolors=face_colours, edgecolors='black', linewidths=0.6, alpha=0.7, rasterized=True)
+    )
+
+# Broken-ore positions in the unit cube, drawn from a fixed seed so the same
+# stope always renders the same image (and the visualization cache can hit)
+_MUCK_UNIT_POINTS = np.random.default_rng(42).random((SHRINKAGE_MUCK_POINTS, 3))
 
 def create_shrinkage_3d(ax, width, height, length, depth, ore_color):
     """Create 3D representation of shrinkage stoping"""
-    vertices = [
-        [0, 0, 0], [length, 0, 0], [length, width, 0], [0, width, 0],
-        [0, 0, height], [length, 0, height], [length, width, height], [0, width, height]
-    ]
-    faces = _prism_faces(vertices)
+    faces = _box_faces(0, length, 0, width, 0, height)
     storage_height = height * 0.6
-    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.5, linewidths=0.6))
-    for i in range(20):
-        x = np.random.uniform(0, length)
-        y = np.random.uniform(0, width)
-        z = np.random.uniform(0, storage_height)
-        ax.scatter(x, y, z, c='orange', s=30, alpha=0.8)
+    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.5, linewidths=0.6, rasterized=True))
+    # Broken ore held in the stope, drawn as a single scatter artist
+    pts = _MUCK_UNIT_POINTS * np.array([length, width, storage_height])
+    ax.scatter(pts[:, 0], pts[:, 1], pts[:, 2], c='orange', s=30, alpha=0.8, rasterized=True)
+
+def _hole_positions(extent, spacing):
+    """Blasthole offsets along one side, thinned to MAX_3D_HOLES_PER_AXIS"""
+    positions = np.arange(spacing, extent, spacing)
+    if positions.size > MAX_3D_HOLES_PER_AXIS:
+        positions = np.linspace(positions[0], positions[-1], MAX_3D_HOLES_PER_AXIS)
+    return positions
 
 def create_vcr_3d(ax, width, height, length, depth, ore_color):
     """Create 3D representation of Vertical Crater Retreat"""
-    vertices = [
-        [0, 0, 0], [length, 0, 0], [length, width, 0], [0, width, 0],
-        [0, 0, height], [length, 0, height], [length, width, height], [0, width, height]
-    ]
-    faces = _prism_faces(vertices)
-    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6))
+    faces = _box_faces(0, length, 0, width, 0, height)
+    ax.add_collection3d(Poly3DCollection(faces, facecolors=ore_color, edgecolors='black', alpha=0.6, linewidths=0.6, rasterized=True))
     hole_spacing = max(3, min(width, length) / 8)
-    for x in np.arange(hole_spacing, length, hole_spacing):
-        for y in np.arange(hole_spacing, width, hole_spacing):
-            ax.plot([x, x], [y, y], [0, height], 'r-', linewidth=3, alpha=0.8)
-
-def add_underground_infrastructure(ax, width, height, length, depth):
-    """Add realistic underground mining infrastructure"""
+    xs, ys = np.meshgrid(_hole_positions(length, hole_spacing),
+                         _hole_positions(width, hole_spacing))
+    if xs.size:
+        # One vertical segment per blasthole, drawn as a single collection
+        segs = np.stack([np.stack([xs, ys, np.zeros_like(xs)], -1),
+                         np.stack([xs, ys, np.full_like(xs, height)], -1)], axis=-2).reshape(-1, 2, 3)
+        ax.add_collection3d(Line3DCollection(segs, colors='red', linewidths=3, alpha=0.8, rasterized=True))
+
+# Legend entries of the infrastructure lines, built once instead of being
+# collected from the axes' artists on every 3D render
+_INFRA_HANDLES = [
+    Line2D([0], [0], color='b', linewidth=6, alpha=0.8, label='Ventilation Raise'),
+    Line2D([0], [0], color='g', linewidth=4, alpha=0.8, label='Ore Pass')
+]
+
+def _drift_faces(length):
+    """Faces of the 4 x 4 m access drift running alongside the stope"""
     drift_width = 4
     drift_height = 4
     drift_y = -drift_width - 2
-    drift_vertices = [
-        [-5, drift_y, 0], [length+5, drift_y, 0], 
-        [length+5, drift_y+drift_width, 0], [-5, drift_y+drift_width, 0],
-        [-5, drift_y, drift_height], [length+5, drift_y, drift_height],
-        [length+5, drift_y+drift_width, drift_height], [-5, drift_y+drift_width, drift_height]
-    ]
-    drift_faces = _prism_faces(drift_vertices)
-    ax.add_collection3d(Poly3DCollection(drift_faces, facecolors='lightgray', edgecolors='black', alpha=0.8, linewidths=0.6))
+    return _box_faces(-5, length+5, drift_y, drift_y+drift_width, 0, drift_height)
+
+# Two triangles per quad face, for the vispy meshes
+_QUAD_TRIANGLES = np.array([[0, 1, 2], [0, 2, 3]])
+
+def _stope_solids(width, height, length, stope_type):
+    """(faces, color, alpha) of the solid parts of the 3D view"""
+    if stope_type == "Room-and-Pillar":
+        (rooms_x0, rooms_x1), (pillars_x0, pillars_x1) = _room_pillar_spans(width, length)
+        solids = [(_box_faces(rooms_x0, rooms_x1, 0, width, 0, height), ORE_COLOR, 0.6),
+                  (_box_faces(pillars_x0, pillars_x1, 0, width, 0, height), SUPPORT_COLOR, 0.8)]
+    elif stope_type == "Cut-and-Fill":
+        z_bottom, z_top = _cut_fill_slices(height)
+        solids = [(_box_faces(0, length, 0, width, z_bottom[0::2], z_top[0::2]), ORE_COLOR, 0.7),
+                  (_box_faces(0, length, 0, width, z_bottom[1::2], z_top[1::2]), WASTE_COLOR, 0.7)]
+    else:
+        solids = [(_box_faces(0, length, 0, width, 0, height), ORE_COLOR, 0.6)]
+    solids.append((_drift_faces(length), 'lightgray', 0.8))
+    return [solid for solid in solids if len(solid[0])]
+
+def _render_3d_vispy(width, height, length, stope_type, filepath):
+    """OpenGL render of the stope solids with vispy, written to filepath"""
+    from matplotlib.colors import to_rgba
+    from vispy import io, scene
+
+    canvas = scene.SceneCanvas(bgcolor='white', size=(1600, 1200), show=False)
+    view = canvas.central_widget.add_view()
+    for faces, color, alpha in _stope_solids(width, height, length, stope_type):
+        triangles = (np.arange(len(faces))[:, None, None] * 4 + _QUAD_TRIANGLES).reshape(-1, 3)
+        scene.visuals.Mesh(vertices=faces.reshape(-1, 3), faces=triangles,
+                           color=to_rgba(color, alpha), parent=view.scene)
+    # Same viewpoint as the matplotlib view_init(elev=20, azim=45)
+    view.camera = scene.TurntableCamera(elevation=20, azimuth=45)
+    view.camera.set_range()
+    _ensure_dir(os.path.dirname(filepath))
+    tmp = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    io.write_png(tmp, canvas.render())
+    canvas.close()
+    os.replace(tmp, filepath)
+
+def add_underground_infrastructure(ax, width, height, length, depth):
+    """Add realistic underground mining infrastructure"""
+    drift_faces = _drift_faces(length)
+    ax.add_collection3d(Poly3DCollection(drift_faces, facecolors='lightgray', edgecolors='black', alpha=0.8, linewidths=0.6, rasterized=True))
     raise_x = length + 8
     raise_y = width / 2
-    ax.plot([raise_x, raise_x], [raise_y, raise_y], [0, height*1.5], 'b-', linewidth=6, alpha=0.8, label='Ventilation Raise')
+    ax.plot([raise_x, raise_x], [raise_y, raise_y], [0, height*1.5], 'b-', linewidth=6, alpha=0.8, label='Ventilation Raise', rasterized=True)
     orepass_x = -3
     orepass_y = width / 2
-    ax.plot([orepass_x, orepass_x], [orepass_y, orepass_y], [0, height], 'g-', linewidth=4, alpha=0.8, label='Ore Pass')
-    ax.legend(loc='upper left', bbox_to_anchor=(0, 1))
+    ax.plot([orepass_x, orepass_x], [orepass_y, orepass_y], [0, height], 'g-', linewidth=4, alpha=0.8, label='Ore Pass', rasterized=True)
+    ax.legend(handles=_INFRA_HANDLES, loc='upper left', bbox_to_anchor=(0, 1))
 
-def create_cross_section_view(width, height, length, depth, stope_type, inputs):
+def create_cross_section_view(width, height, length, depth, stope_type, inputs, output_dir='reports'):
     """Create detailed cross-section view"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 4))
-
-    # Longitudinal section
-    ax1.add_patch(plt.Rectangle((0, -depth), length, height, 
-                               facecolor='gold', alpha=0.7, edgecolor='black', linewidth=2))
-
-    # Draw ore-body layer in cross-section at face
-    ore_t = inputs.get('ore_thickness', 1)
-    ax1.add_patch(
-        plt.Rectangle((0, -depth), length, ore_t,
-                     facecolor='orange', alpha=0.5, edgecolor='none',
-                     label=f'Orebody ({ore_t} m)')
-    )
-    ax1.legend(loc='upper right')
-
-    # Draw geological layer
-    layer_depth = -depth - 50
-    ax1.axhline(y=layer_depth, color='brown', linestyle='--', alpha=0.6)
-    ax1.text(length/2, layer_depth-10, 'Geological Layer 1', ha='center', fontsize=9)
-
-    # Cross section
-    ax2.add_patch(plt.Rectangle((0, -depth), width, height,
-                               facecolor='gold', alpha=0.7, edgecolor='black', linewidth=2))
-
-    # Draw ore-body layer in cross-section ax2
-    ax2.add_patch(
-        plt.Rectangle((0, -depth), width, ore_t,
-                     facecolor='orange', alpha=0.5, edgecolor='none')
-    )
+    with _shared_figure('stope_cross_sections', (8, 4)) as fig:
+        ax1, ax2 = fig.subplots(1, 2)
+
+        # Longitudinal section
+        ax1.add_patch(Rectangle((0, -depth), length, height, 
+                                   facecolor='gold', alpha=0.7, edgecolor='black', linewidth=2))
+
+        # Draw ore-body layer in cross-section at face
+        ore_t = inputs.get('ore_thickness', 1)
+        ax1.add_patch(
+            Rectangle((0, -depth), length, ore_t,
+                         facecolor='orange', alpha=0.5, edgecolor='none',
+                         label=f'Orebody ({ore_t} m)')
+        )
+        ax1.legend(loc='upper right')
+
+        # Draw geological layers every 50 m below the stope as one collection
+        # of full-width lines (x in axes coordinates, like axhline)
+        layer_depths = -depth - np.arange(1, GEOLOGICAL_LAYERS + 1) * 50
+        ax1.add_collection(LineCollection([[(0, y), (1, y)] for y in layer_depths],
+                                          transform=ax1.get_yaxis_transform(),
+                                          colors='brown', linestyles='--', alpha=0.6),
+                           autolim=False)
+        for n, layer_depth in enumerate(layer_depths, 1):
+            ax1.text(length/2, layer_depth-10, f'Geological Layer {n}', ha='center', fontsize=9)
+
+        # Cross section: stope, ore-body layer and any support, kept in
+        # drawing order in one collection
+        section = [
+            Rectangle((0, -depth), width, height,
+                      facecolor='gold', alpha=0.7, edgecolor='black', linewidth=2),
+            Rectangle((0, -depth), width, ore_t,
+                      facecolor='orange', alpha=0.5, edgecolor='none'),
+        ]
 
-    # Add support elements based on stope type
-    if stope_type == "Room-and-Pillar":
-        pillar_width = width * 0.3
-        ax2.add_patch(plt.Rectangle((width*0.35, -depth), pillar_width, height,
-                                   facecolor='gray', alpha=0.9, edgecolor='black'))
-
-    # Add dimensions
-    ax1.annotate('', xy=(0, -depth+height+10), xytext=(length, -depth+height+10),
-                arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax1.text(length/2, -depth+height+20, f'Length: {length}m', 
-            ha='center', fontsize=12, color='red', weight='bold')
-
-    ax2.annotate('', xy=(0, -depth+height+10), xytext=(width, -depth+height+10),
-                arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax2.text(width/2, -depth+height+20, f'Width: {width}m', 
-            ha='center', fontsize=12, color='red', weight='bold')
-
-    ax1.annotate('', xy=(-20, 0), xytext=(-20, -depth),
-                arrowprops=dict(arrowstyle='<->', color='blue', lw=2))
-    ax1.text(-40, -depth/2, f'Depth: {depth}m', rotation=90,
-            ha='center', va='center', fontsize=12, color='blue', weight='bold')
-
-    # Set titles and labels
-    ax1.set_title(f'{stope_type} - Longitudinal Section', fontsize=14, weight='bold')
-    ax2.set_title(f'{stope_type} - Cross Section', fontsize=14, weight='bold')
+        # Add support elements based on stope type
+        if stope_type == "Room-and-Pillar":
+            pillar_width = width * 0.3
+            section.append(Rectangle((width*0.35, -depth), pillar_width, height,
+                                     facecolor='gray', alpha=0.9, edgecolor='black'))
+        ax2.add_collection(PatchCollection(section, match_original=True))
+
+        # Add dimensions
+        ax1.annotate('', xy=(0, -depth+height+10), xytext=(length, -depth+height+10),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=2))
+        ax1.text(length/2, -depth+height+20, f'Length: {length}m', 
+                ha='center', fontsize=12, color='red', weight='bold')
+
+        ax2.annotate('', xy=(0, -depth+height+10), xytext=(width, -depth+height+10),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=2))
+        ax2.text(width/2, -depth+height+20, f'Width: {width}m', 
+                ha='center', fontsize=12, color='red', weight='bold')
+
+        ax1.annotate('', xy=(-20, 0), xytext=(-20, -depth),
+                    arrowprops=dict(arrowstyle='<->', color='blue', lw=2))
+        ax1.text(-40, -depth/2, f'Depth: {depth}m', rotation=90,
+                ha='center', va='center', fontsize=12, color='blue', weight='bold')
+
+        # Set titles and labels
+        ax1.set_title(f'{stope_type} - Longitudinal Section', fontsize=14, weight='bold')
+        ax2.set_title(f'{stope_type} - Cross Section', fontsize=14, weight='bold')
     
-    ax1.set_xlabel('Length (m)')
-    ax1.set_ylabel('Elevation (m)')
-    ax2.set_xlabel('Width (m)')
-    ax2.set_ylabel('Elevation (m)')
+        ax1.set_xlabel('Length (m)')
+        ax1.set_ylabel('Elevation (m)')
+        ax2.set_xlabel('Width (m)')
+        ax2.set_ylabel('Elevation (m)')
     
-    # Add grid
-    ax1.grid(True, alpha=0.3)
-    ax2.grid(True, alpha=0.3)
+        # Add grid
+        ax1.grid(True, alpha=0.3)
+        ax2.grid(True, alpha=0.3)
     
-    # Set equal aspect ratio
-    ax1.set_aspect('equal')
-    ax2.set_aspect('equal')
+        # Set equal aspect ratio
+        ax1.set_aspect('equal')
+        ax2.set_aspect('equal')
     
-    # Manually adjust margins
-    fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.1)
+        # Manually adjust margins
+        fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.1)
     
-    # Set tight y-limits to remove blank space below
-    y_min = -depth - 10
-    y_max = height + 20
-    ax1.set_ylim(y_min, y_max)
-    ax2.set_ylim(y_min, y_max)
+        # Set tight y-limits to remove blank space below
+        y_min = -depth - 10
+        y_max = height + 20
+        ax1.set_ylim(y_min, y_max)
+        ax2.set_ylim(y_min, y_max)
 
-    _save_fig(fig, 'reports/stope_cross_sections.png', base_dpi=100)
-    plt.close()
+        return _save_fig(fig, os.path.join(output_dir, 'stope_cross_sections.png'), base_dpi=100,
+                  bbox_inches='tight')
 
-def create_plan_view(width, length, stope_type, inputs):
+def create_plan_view(width, length, stope_type, inputs, output_dir='reports'):
     """Create plan view showing stope layout"""
-    fig, ax = plt.subplots(figsize=(12, 8))
-    # Orebody thickness footprint
-    ore_t = inputs.get('ore_thickness', 1)
-    # Draw orebody footprint centered in width
-    ax.add_patch(
-        plt.Rectangle((0, (width-ore_t)/2), length, ore_t,
-                     facecolor='orange', alpha=0.5, edgecolor='none',
-                     label=f'Orebody ({ore_t} m)')
-    )
-    ax.legend(loc='upper right')
+    with _shared_figure('stope_plan_view', (12, 8)) as fig:
+        ax = fig.subplots()
+        # Orebody thickness footprint
+        ore_t = inputs.get('ore_thickness', 1)
+        # Draw orebody footprint centered in width
+        ax.add_patch(
+            Rectangle((0, (width-ore_t)/2), length, ore_t,
+                         facecolor='orange', alpha=0.5, edgecolor='none',
+                         label=f'Orebody ({ore_t} m)')
+        )
+        ax.legend(loc='upper right')
 
-    if stope_type == "Room-and-Pillar":
-        # Create room and pillar grid pattern
-        pillar_size = min(width, length) * 0.25
-        room_size = min(width, length) * 0.35
+        if stope_type == "Room-and-Pillar":
+            # Create room and pillar grid pattern
+            pillar_size = min(width, length) * 0.25
+            room_size = min(width, length) * 0.35
         
-        step = room_size + pillar_size
-        for i in np.arange(0, length, step):
-            for j in np.arange(0, width, step):
-                # Room
-                if i + room_size <= length and j + room_size <= width:
-                    room = plt.Rectangle((i, j), room_size, room_size,
-                                       facecolor='gold', alpha=0.8, edgecolor='black')
-                    ax.add_patch(room)
-                    ax.text(i + room_size/2, j + room_size/2, 'ROOM',
-                           ha='center', va='center', fontsize=8, weight='bold')
-                
-                # Pillar
-                pillar_x = i + room_size
-                pillar_y = j + room_size
-                if pillar_x + pillar_size <= length and pillar_y + pillar_size <= width:
-                    pillar = plt.Rectangle((pillar_x, pillar_y), pillar_size, pillar_size,
-                                         facecolor='gray', alpha=0.9, edgecolor='black')
-                    ax.add_patch(pillar)
-                    ax.text(pillar_x + pillar_size/2, pillar_y + pillar_size/2, 'PILLAR',
-                           ha='center', va='center', fontsize=6, weight='bold')
-    else:
-        # Single large stope - show actual calculated dimensions
-        main_stope = plt.Rectangle((0, 0), length, width,
-                                 facecolor='gold', alpha=0.7, edgecolor='black', linewidth=3)
-        ax.add_patch(main_stope)
+            step = room_size + pillar_size
+            gx, gy = np.meshgrid(np.arange(0, length, step), np.arange(0, width, step), indexing='ij')
+            gx, gy = gx.ravel(), gy.ravel()
+            rooms = (gx + room_size <= length) & (gy + room_size <= width)
+            pillar_x, pillar_y = gx + room_size, gy + room_size
+            pillars = (pillar_x + pillar_size <= length) & (pillar_y + pillar_size <= width)
+
+            # Rooms and pillars are added as one collection each
+            ax.add_collection(PatchCollection(
+                [Rectangle((x, y), room_size, room_size) for x, y in zip(gx[rooms], gy[rooms])],
+                facecolor='gold', alpha=0.8, edgecolor='black'))
+            ax.add_collection(PatchCollection(
+                [Rectangle((x, y), pillar_size, pillar_size) for x, y in zip(pillar_x[pillars], pillar_y[pillars])],
+                facecolor='gray', alpha=0.9, edgecolor='black'))
+            room_labels = np.column_stack([gx[rooms], gy[rooms]]) + room_size/2
+            pillar_labels = np.column_stack([pillar_x[pillars], pillar_y[pillars]]) + pillar_size/2
+            # Dense grids label only the first and last cell of each kind
+            if len(room_labels) > MAX_PLAN_LABELS:
+                room_labels = room_labels[[0, -1]]
+            if len(pillar_labels) > MAX_PLAN_LABELS:
+                pillar_labels = pillar_labels[[0, -1]]
+            for x, y in room_labels:
+                ax.text(x, y, 'ROOM', ha='center', va='center', fontsize=8, weight='bold')
+            for x, y in pillar_labels:
+                ax.text(x, y, 'PILLAR', ha='center', va='center', fontsize=6, weight='bold')
+        else:
+            # Single large stope - show actual calculated dimensions
+            main_stope = Rectangle((0, 0), length, width,
+                                     facecolor='gold', alpha=0.7, edgecolor='black', linewidth=3)
+            ax.add_patch(main_stope)
         
-        # Add dimension text with formula explanation
-        ax.text(length/2, width/2, f'{stope_type.upper()}\nSTOPE\n\nL = {length}m (W × 10)\nW = {width}m',
-               ha='center', va='center', fontsize=12, weight='bold',
-               bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
+            # Add dimension text with formula explanation
+            ax.text(length/2, width/2, f'{stope_type.upper()}\nSTOPE\n\nL = {length}m (W × 10)\nW = {width}m',
+                   ha='center', va='center', fontsize=12, weight='bold',
+                   bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
         
-        # Add corner reinforcement symbols
-        corner_size = min(length, width) * 0.05
-        corners = [(0, 0), (length-corner_size, 0), (length-corner_size, width-corner_size), (0, width-corner_size)]
-        for x, y in corners:
-            corner = plt.Rectangle((x, y), corner_size, corner_size,
-                                 facecolor='red', alpha=0.8, edgecolor='black')
-            ax.add_patch(corner)
+            # Add corner reinforcement symbols
+            corner_size = min(length, width) * 0.05
+            corners = [(0, 0), (length-corner_size, 0), (length-corner_size, width-corner_size), (0, width-corner_size)]
+            ax.add_collection(PatchCollection(
+                [Rectangle((x, y), corner_size, corner_size) for x, y in corners],
+                facecolor='red', alpha=0.8, edgecolor='black'))
     
-    # Add access infrastructure
-    # Main drift
-    drift_width = min(width, length) * 0.1
-    drift = plt.Rectangle((-drift_width, width/2 - drift_width/2), drift_width, drift_width,
-                         facecolor='lightgray', edgecolor='black')
-    ax.add_patch(drift)
-    ax.text(-drift_width/2, width/2, 'ACCESS\nDRIFT', ha='center', va='center', 
-           fontsize=8, weight='bold', rotation=90)
+        # Add access infrastructure
+        # Main drift
+        drift_width = min(width, length) * 0.1
+        drift = Rectangle((-drift_width, width/2 - drift_width/2), drift_width, drift_width,
+                             facecolor='lightgray', edgecolor='black')
+        ax.add_patch(drift)
+        ax.text(-drift_width/2, width/2, 'ACCESS\nDRIFT', ha='center', va='center', 
+               fontsize=8, weight='bold', rotation=90)
     
-    # Ore pass
-    orepass = plt.Circle((length*0.1, width*0.9), 1, facecolor='green', edgecolor='black')
-    ax.add_patch(orepass)
-    ax.text(length*0.1, width*0.9 + 3, 'ORE PASS', ha='center', fontsize=8, weight='bold')
+        # Ore pass
+        orepass = Circle((length*0.1, width*0.9), 1, facecolor='green', edgecolor='black')
+        ax.add_patch(orepass)
+        ax.text(length*0.1, width*0.9 + 3, 'ORE PASS', ha='center', fontsize=8, weight='bold')
     
-    # Ventilation raise
-    vent_raise = plt.Circle((length*0.9, width*0.1), 1, facecolor='blue', edgecolor='black')
-    ax.add_patch(vent_raise)
-    ax.text(length*0.9, width*0.1 - 3, 'VENT RAISE', ha='center', fontsize=8, weight='bold')
+        # Ventilation raise
+        vent_raise = Circle((length*0.9, width*0.1), 1, facecolor='blue', edgecolor='black')
+        ax.add_patch(vent_raise)
+        ax.text(length*0.9, width*0.1 - 3, 'VENT RAISE', ha='center', fontsize=8, weight='bold')
     
-    # Add dimensions with formulas
-    ax.annotate('', xy=(0, -width*0.1), xytext=(length, -width*0.1),
-                arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax.text(length/2, -width*0.15, f'Length: {length}m (Width × 10)', ha='center', 
-           fontsize=12, color='red', weight='bold',
-           bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9))
+        # Add dimensions with formulas
+        ax.annotate('', xy=(0, -width*0.1), xytext=(length, -width*0.1),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=2))
+        ax.text(length/2, -width*0.15, f'Length: {length}m (Width × 10)', ha='center', 
+               fontsize=12, color='red', weight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9))
     
-    ax.annotate('', xy=(-length*0.1, 0), xytext=(-length*0.1, width),
-                arrowprops=dict(arrowstyle='<->', color='red', lw=2))
-    ax.text(-length*0.15, width/2, f'Width: {width}m (2 × HR)', rotation=90, ha='center', va='center',
-           fontsize=12, color='red', weight='bold',
-           bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9))
+        ax.annotate('', xy=(-length*0.1, 0), xytext=(-length*0.1, width),
+                    arrowprops=dict(arrowstyle='<->', color='red', lw=2))
+        ax.text(-length*0.15, width/2, f'Width: {width}m (2 × HR)', rotation=90, ha='center', va='center',
+               fontsize=12, color='red', weight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.9))
     
-    ax.set_title(f'{stope_type} - Plan View (Standard Dimensions)', fontsize=16, weight='bold', pad=20)
-    ax.set_xlabel('Length (m)', fontsize=12)
-    ax.set_ylabel('Width (m)', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    ax.set_aspect('equal')
+        ax.set_title(f'{stope_type} - Plan View (Standard Dimensions)', fontsize=16, weight='bold', pad=20)
+        ax.set_xlabel('Length (m)', fontsize=12)
+        ax.set_ylabel('Width (m)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.set_aspect('equal')
     
-    # Set limits with margin
-    ax.set_xlim(-length*0.2, length*1.1)
-    ax.set_ylim(-width*0.2, width*1.1)
+        # Set limits with margin
+        ax.set_xlim(-length*0.2, length*1.1)
+        ax.set_ylim(-width*0.2, width*1.1)
     
-    fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-    _save_fig(fig, 'reports/stope_plan_view.png')
-    plt.close()
+        fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+        return _save_fig(fig, os.path.join(output_dir, 'stope_plan_view.png'), bbox_inches='tight')
+
+# Safety factor gauge geometry. The zones never change, so the arc angles and
+# label positions are computed once at import rather than per gauge.
+_GAUGE_MAX = 4
+_GAUGE_RADIUS = 1.0
+_GAUGE_BAND = 0.15      # arc thickness in data units, about a 25 pt stroke
+_GAUGE_ZONES = (0, 1.5, 2.0, 3.0, _GAUGE_MAX)   # danger | warning | ok | excellent
+_GAUGE_ARC_POINTS = (50, 25, 25, 25)
+_GAUGE_ARC_COLORS = ('#FF4136', '#FFDC00', '#2ECC40', '#0074D9')
+_GAUGE_LABELS = (
+    ("UNSAFE\n< 1.5", '#FF4136'),
+    ("MARGINAL\n1.5-2.0", '#B8860B'),
+    ("STABLE\n2.0-3.0", '#228B22'),
+    ("EXCELLENT\n> 3.0", '#0074D9')
+)
+
+def _gauge_geometry():
+    """Arc angles (degrees) and zone label positions of the safety factor gauge"""
+    arcs, labels = [], []
+    for lo, hi, n in zip(_GAUGE_ZONES, _GAUGE_ZONES[1:], _GAUGE_ARC_POINTS):
+        arc = np.linspace((lo/_GAUGE_MAX) * np.pi, (hi/_GAUGE_MAX) * np.pi, n)
+        arcs.append((lo/_GAUGE_MAX * 180, hi/_GAUGE_MAX * 180))
+        # Labels sit beyond the middle point of their arc
+        mid = arc[n // 2]
+        labels.append((_GAUGE_RADIUS * np.cos(mid) * 1.3, _GAUGE_RADIUS * np.sin(mid) * 1.3))
+    return tuple(arcs), tuple(labels)
+
+_GAUGE_ARC_ANGLES, _GAUGE_LABEL_XY = _gauge_geometry()
+
+def _build_gauge_template():
+    """Gauge figure with the fixed arcs, labels and DGMS marker"""
+    fig = _new_figure((10, 6))
+    ax = fig.subplots()
+
+    gauge_max = _GAUGE_MAX
+
+    # Background arcs, one annular wedge per zone centred on the gauge radius
+    for (theta1, theta2), color in zip(_GAUGE_ARC_ANGLES, _GAUGE_ARC_COLORS):
+        ax.add_patch(Wedge((0, 0), _GAUGE_RADIUS + _GAUGE_BAND/2, theta1, theta2, width=_GAUGE_BAND,
+                           facecolor=color, edgecolor='none', alpha=0.8))
+
+    # Safety factor needle, pointed at the value on every use
+    needle = ax.arrow(0, 0, 0.8, 0, head_width=0.08, head_length=0.05,
+                      fc='black', ec='black', linewidth=3)
 
-def generate_safety_factor_gauge(safety_factor):
-    """Enhanced safety factor gauge visualization"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Gauge parameters
-    gauge_max = 4
-    danger_zone = 1.5
-    warning_zone = 2.0
-    safe_zone = 3.0
-    
-    # Create semicircle gauge
-    r = 1.0
-    
-    # Background arcs
-    danger_arc = np.linspace(0, (danger_zone/gauge_max) * np.pi, 50)
-    warning_arc = np.linspace((danger_zone/gauge_max) * np.pi, (warning_zone/gauge_max) * np.pi, 25)
-    ok_arc = np.linspace((warning_zone/gauge_max) * np.pi, (safe_zone/gauge_max) * np.pi, 25)
-    excellent_arc = np.linspace((safe_zone/gauge_max) * np.pi, np.pi, 25)
-    
-    # Plot arcs with improved styling
-    ax.plot(r * np.cos(danger_arc), r * np.sin(danger_arc), linewidth=25, 
-           color='#FF4136', alpha=0.8, solid_capstyle='round')
-    ax.plot(r * np.cos(warning_arc), r * np.sin(warning_arc), linewidth=25, 
-           color='#FFDC00', alpha=0.8, solid_capstyle='round')
-    ax.plot(r * np.cos(ok_arc), r * np.sin(ok_arc), linewidth=25, 
-           color='#2ECC40', alpha=0.8, solid_capstyle='round')
-    ax.plot(r * np.cos(excellent_arc), r * np.sin(excellent_arc), linewidth=25, 
-           color='#0074D9', alpha=0.8, solid_capstyle='round')
-    
-    # Safety factor needle
-    needle_value = min(safety_factor, gauge_max)
-    needle_angle = (needle_value / gauge_max) * np.pi
-    
-    ax.arrow(0, 0, 0.8 * np.cos(needle_angle), 0.8 * np.sin(needle_angle),
-             head_width=0.08, head_length=0.05, fc='black', ec='black', linewidth=3)
-    
     # Center hub
-    circle = plt.Circle((0, 0), 0.08, color='black', zorder=5)
+    circle = Circle((0, 0), 0.08, color='black', zorder=5)
     ax.add_patch(circle)
-    
+
     # Labels and values
-    ax.text(0, -0.3, f"Safety Factor: {safety_factor}", fontsize=16, ha='center', 
-           weight='bold', bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
-    
+    value_text = ax.text(0, -0.3, "", fontsize=16, ha='center',
+                         weight='bold', bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
+
     # Zone labels
-    ax.text(r * np.cos(danger_arc[25]) * 1.3, r * np.sin(danger_arc[25]) * 1.3, 
-           "UNSAFE\n< 1.5", fontsize=10, ha='center', va='center', weight='bold', color='#FF4136')
-    ax.text(r * np.cos(warning_arc[12]) * 1.3, r * np.sin(warning_arc[12]) * 1.3, 
-           "MARGINAL\n1.5-2.0", fontsize=10, ha='center', va='center', weight='bold', color='#B8860B')
-    ax.text(r * np.cos(ok_arc[12]) * 1.3, r * np.sin(ok_arc[12]) * 1.3, 
-           "STABLE\n2.0-3.0", fontsize=10, ha='center', va='center', weight='bold', color='#228B22')
-    ax.text(r * np.cos(excellent_arc[12]) * 1.3, r * np.sin(excellent_arc[12]) * 1.3, 
-           "EXCELLENT\n> 3.0", fontsize=10, ha='center', va='center', weight='bold', color='#0074D9')
-    
+    for (x, y), (text, color) in zip(_GAUGE_LABEL_XY, _GAUGE_LABELS):
+        ax.text(x, y, text, fontsize=10, ha='center', va='center', weight='bold', color=color)
+
     # DGMS minimum line
     dgms_angle = (DGMS_SAFETY_FACTOR_MIN / gauge_max) * np.pi
-    ax.plot([0, 1.2 * np.cos(dgms_angle)], [0, 1.2 * np.sin(dgms_angle)], 
+    ax.plot([0, 1.2 * np.cos(dgms_angle)], [0, 1.2 * np.sin(dgms_angle)],
            'r--', linewidth=3, alpha=0.9)
-    ax.text(1.3 * np.cos(dgms_angle), 1.3 * np.sin(dgms_angle), 
-           f'DGMS Min\n({DGMS_SAFETY_FACTOR_MIN})', fontsize=9, color='red', 
+    ax.text(1.3 * np.cos(dgms_angle), 1.3 * np.sin(dgms_angle),
+           f'DGMS Min\n({DGMS_SAFETY_FACTOR_MIN})', fontsize=9, color='red',
            ha='center', va='center', weight='bold',
            bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-    
+
     # Compliance status
-    if safety_factor >= DGMS_SAFETY_FACTOR_MIN:
-        status_text = "✓ DGMS COMPLIANT"
-        status_color = '#2ECC40'
-    else:
-        status_text = "✗ BELOW DGMS STANDARD"
-        status_color = '#FF4136'
-    
-    ax.text(0, -0.55, status_text, fontsize=14, ha='center', weight='bold', color=status_color,
-           bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
-    
+    status_text = ax.text(0, -0.55, "", fontsize=14, ha='center', weight='bold',
+                          bbox=dict(boxstyle="round,pad=0.5", facecolor="white", alpha=0.9))
+
     # Set plot properties
     ax.set_xlim(-1.5, 1.5)
     ax.set_ylim(-0.7, 1.5)
     ax.set_aspect('equal')
     ax.axis('off')
     ax.set_title('Stope Stability Safety Factor Analysis', fontsize=18, weight='bold', pad=30)
-    
+
     fig.subplots_adjust(left=0.05, right=0.95, top=0.9, bottom=0.05)
-    _save_fig(fig, 'reports/safety_factor_gauge.png')
-    plt.close()
+    return fig, {'needle': needle, 'value': value_text, 'status': status_text}
 
-def create_stress_analysis_chart(vertical_stress, horizontal_stress, rock_strength):
-    """Create enhanced stress vs strength comparison"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-    
-    # Bar chart comparison
+def generate_safety_factor_gauge(safety_factor, output_dir='reports'):
+    """Enhanced safety factor gauge visualization"""
+    filepath = os.path.join(output_dir, 'safety_factor_gauge.png')
+    key = _viz_cache_key(('safety_factor_gauge', safety_factor))
+    if _render_is_current(filepath, key, [filepath]):
+        return None
+    with _template_figure('safety_factor_gauge', _build_gauge_template) as (fig, handles):
+        needle_value = min(safety_factor, _GAUGE_MAX)
+        needle_angle = (needle_value / _GAUGE_MAX) * np.pi
+        handles['needle'].set_data(dx=0.8 * np.cos(needle_angle), dy=0.8 * np.sin(needle_angle))
+        handles['value'].set_text(f"Safety Factor: {safety_factor}")
+
+        if safety_factor >= DGMS_SAFETY_FACTOR_MIN:
+            handles['status'].set_text("✓ DGMS COMPLIANT")
+            handles['status'].set_color('#2ECC40')
+        else:
+            handles['status'].set_text("✗ BELOW DGMS STANDARD")
+            handles['status'].set_color('#FF4136')
+
+        _save_fig(fig, filepath)
+    _record_render(filepath, key)
+
+def _stress_profile(depths):
+    """Vertical and horizontal stress columns for an array of depths"""
+    k_ratio = _k_ratio_batch(depths)
+    return (depths * IBE_STRESS_FACTOR)[:, None] * np.stack([np.ones_like(depths), k_ratio], axis=1)
+
+# Stress-with-depth curves of the comparison chart; identical for every design
+_STRESS_PROFILE_DEPTHS = np.linspace(0, 1000, 50)
+_STRESS_PROFILE = _stress_profile(_STRESS_PROFILE_DEPTHS)
+
+def _build_stress_chart_template():
+    """Stress comparison figure with the fixed depth profile, without design values"""
+    fig = _new_figure((16, 6))
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Bar chart comparison, heights set on every use
     categories = ['Vertical\nStress', 'Horizontal\nStress', 'Rock\nStrength']
-    values = [vertical_stress, horizontal_stress, rock_strength]
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
-    
-    bars = ax1.bar(categories, values, color=colors, alpha=0.8, edgecolor='black', linewidth=2)
-    
-    # Add DGMS minimum requirement line
-    dgms_min_strength = vertical_stress * DGMS_SAFETY_FACTOR_MIN
-    ax1.axhline(y=dgms_min_strength, color='red', linestyle='--', linewidth=3, alpha=0.8,
-               label=f'DGMS Min. Required ({dgms_min_strength:.2f} MPa)')
-    
-    # Value labels on bars
-    for bar, value in zip(bars, values):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + max(values)*0.02,
-                f'{value:.2f} MPa', ha='center', va='bottom', fontsize=12, weight='bold')
-    
+    bars = ax1.bar(categories, [0, 0, 0], color=colors, alpha=0.8, edgecolor='black', linewidth=2)
+
+    # DGMS minimum requirement line
+    dgms_line = ax1.axhline(y=0, color='red', linestyle='--', linewidth=3, alpha=0.8)
+
     ax1.set_title('Stress vs. Strength Comparison', fontsize=14, weight='bold')
     ax1.set_ylabel('Stress/Strength (MPa)', fontsize=12)
-    ax1.legend(fontsize=10)
     ax1.grid(axis='y', alpha=0.3)
-    
+
     # Stress distribution with depth using updated k-ratio
-    depths = np.linspace(0, 1000, 50)
-    v_stress = depths * IBE_STRESS_FACTOR
-    # Use the actual k-ratio formula for horizontal stress
-    h_stress = np.array([v_stress[i] * calculate_horizontal_k_ratio_standard(depths[i]) for i in range(len(depths))])
-    
-    ax2.plot(v_stress, depths, 'r-', linewidth=3, label='Vertical Stress', alpha=0.8)
-    ax2.plot(h_stress, depths, 'b-', linewidth=3, label='Horizontal Stress (k-ratio)', alpha=0.8)
-    ax2.axhline(y=vertical_stress/IBE_STRESS_FACTOR, color='orange', linestyle=':', 
-               linewidth=3, label=f'Current Depth ({vertical_stress/IBE_STRESS_FACTOR:.0f}m)')
-    
-    # Add k-ratio annotation
-    current_depth = vertical_stress/IBE_STRESS_FACTOR
-    current_k = calculate_horizontal_k_ratio_standard(current_depth)
-    ax2.text(max(v_stress)*0.7, current_depth + 50, f'k-ratio = {current_k:.2f}', 
-             fontsize=10, weight='bold', 
-             bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
-    
+    # Vertical stress is linear in depth, so its two end points suffice;
+    # the k-ratio curve keeps the full sampling for its bends
+    ends = [0, -1]
+    ax2.plot(_STRESS_PROFILE[ends, 0], _STRESS_PROFILE_DEPTHS[ends], 'r-', linewidth=3,
+             label='Vertical Stress', alpha=0.8)
+    ax2.plot(_STRESS_PROFILE[:, 1], _STRESS_PROFILE_DEPTHS, 'b-', linewidth=3,
+             label='Horizontal Stress (k-ratio)', alpha=0.8)
+    depth_line = ax2.axhline(y=0, color='orange', linestyle=':', linewidth=3)
+
+    # k-ratio annotation, moved to the current depth on every use
+    k_text = ax2.text(_STRESS_PROFILE[:, 0].max()*0.7, 0, '',
+                      fontsize=10, weight='bold',
+                      bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8))
+
     ax2.set_title('Stress vs. Depth (Brown-Hoek k-ratio)', fontsize=14, weight='bold')
     ax2.set_xlabel('Stress (MPa)', fontsize=12)
     ax2.set_ylabel('Depth (m)', fontsize=12)
-    ax2.legend(fontsize=10)
     ax2.grid(True, alpha=0.3)
     ax2.invert_yaxis()
-    
+
     fig.subplots_adjust(left=0.08, right=0.92, top=0.9, bottom=0.1, wspace=0.25)
-    _save_fig(fig, 'reports/stress_strength_comparison.png')
-    plt.close()
+    return fig, {'axes': (ax1, ax2), 'bars': bars, 'bar_labels': [], 'dgms': dgms_line,
+                 'depth': depth_line, 'k_text': k_text}
+
+def create_stress_analysis_chart(vertical_stress, horizontal_stress, rock_strength, output_dir='reports'):
+    """Create enhanced stress vs strength comparison"""
+    filepath = os.path.join(output_dir, 'stress_strength_comparison.png')
+    key = _viz_cache_key(('stress_strength_comparison', vertical_stress, horizontal_stress, rock_strength))
+    if _render_is_current(filepath, key, [filepath]):
+        return None
+    with _template_figure('stress_strength_comparison', _build_stress_chart_template) as (fig, handles):
+        ax1, ax2 = handles['axes']
+
+        values = (vertical_stress, horizontal_stress, rock_strength)
+        for bar, value in zip(handles['bars'], values):
+            bar.set_height(value)
+        # Value labels on bars; the container's own values are the template's zeros
+        for label in handles['bar_labels']:
+            label.remove()
+        handles['bar_labels'] = ax1.bar_label(handles['bars'], labels=['%.2f MPa' % v for v in values],
+                                              padding=6, fontsize=12, weight='bold')
+
+        dgms_min_strength = vertical_stress * DGMS_SAFETY_FACTOR_MIN
+        handles['dgms'].set_ydata([dgms_min_strength, dgms_min_strength])
+        handles['dgms'].set_label(f'DGMS Min. Required ({dgms_min_strength:.2f} MPa)')
+        ax1.legend(fontsize=10)
+
+        current_depth = vertical_stress/IBE_STRESS_FACTOR
+        current_k = calculate_horizontal_k_ratio_standard(current_depth)
+        handles['depth'].set_ydata([current_depth, current_depth])
+        handles['depth'].set_label(f'Current Depth ({current_depth:.0f}m)')
+        handles['k_text'].set_y(current_depth + 50)
+        handles['k_text'].set_text(f'k-ratio = {current_k:.2f}')
+        ax2.legend(fontsize=10)
+
+        for ax in (ax1, ax2):
+            ax.relim()
+            ax.autoscale_view()
+        _save_fig(fig, filepath)
+    _record_render(filepath, key)
 
 # Legacy function for backward compatibility
 def generate_stability_visualization(safety_factor, vertical_stress, horizontal_stress, rock_strength):
     """Legacy wrapper for the enhanced visualization system"""
+    warnings.warn("generate_stability_visualization is deprecated; use "
+                  "generate_enhanced_stope_visualizations", DeprecationWarning, stacklevel=2)
+    # Both charts skip themselves when reports/ already holds them for these values
     generate_safety_factor_gauge(safety_factor)
     create_stress_analysis_chart(vertical_stress, horizontal_stress, rock_strength)
 
+_STABILITY_POINT_DTYPE = np.dtype([('safety_factor', 'f8'), ('depth', 'f8')])
+
+def _build_stability_plot_template():
+    """Safety factor over depth chart, without data"""
+    fig = _new_figure((10, 6))
+    ax = fig.subplots()
+    line, = ax.plot([], [], marker='o', linewidth=3, markersize=8, label='Safety Factor')
+    ax.axhline(y=DGMS_SAFETY_FACTOR_MIN, color='r', linestyle='--', linewidth=2,
+               label=f'DGMS Minimum ({DGMS_SAFETY_FACTOR_MIN})')
+    ax.set_title('Stability Analysis Over Depth (DGMS Standards)', fontsize=14, weight='bold')
+    ax.set_xlabel('Depth (m)', fontsize=12)
+    ax.set_ylabel('Safety Factor', fontsize=12)
+    ax.legend(fontsize=10)
+    ax.grid(True, alpha=0.3)
+    fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.12)
+    return fig, {'ax': ax, 'line': line}
+
 def plot_stability_analysis(stability_data):
+    """
+    Safety factor over depth chart, saved to reports/stability_analysis_plot.png.
+
+    stability_data is a list of dicts with 'safety_factor' and 'depth', or a
+    dict of arrays under those keys such as an assess_stability_batch
+    result, which is plotted without unpacking it point by point.
+    """
     try:
-        factors = [data['safety_factor'] for data in stability_data]
-        depths = [data['depth'] for data in stability_data]
-        fig = plt.figure(figsize=(10, 6))
-        plt.plot(depths, factors, marker='o', linewidth=3, markersize=8, label='Safety Factor')
-        plt.axhline(y=DGMS_SAFETY_FACTOR_MIN, color='r', linestyle='--', linewidth=2,
-                   label=f'DGMS Minimum ({DGMS_SAFETY_FACTOR_MIN})')
-        plt.title('Stability Analysis Over Depth (DGMS Standards)', fontsize=14, weight='bold')
-        plt.xlabel('Depth (m)', fontsize=12)
-        plt.ylabel('Safety Factor', fontsize=12)
-        plt.legend(fontsize=10)
-        plt.grid(True, alpha=0.3)
-        fig.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.12)
-        _save_fig(fig, 'reports/stability_analysis_plot.png')
-        plt.close()
+        if isinstance(stability_data, dict):
+            depth = np.ravel(stability_data['depth'])
+            safety_factor = np.ravel(stability_data['safety_factor'])
+        else:
+            # Both columns gathered in one pass into a structured array
+            points = np.fromiter(((data['safety_factor'], data['depth']) for data in stability_data),
+                                 dtype=_STABILITY_POINT_DTYPE, count=len(stability_data))
+            depth, safety_factor = points['depth'], points['safety_factor']
+        with _template_figure('stability_analysis_plot', _build_stability_plot_template) as (fig, handles):
+            handles['line'].set_data(depth, safety_factor)
+            handles['ax'].relim()
+            handles['ax'].autoscale_view()
+            _save_fig(fig, 'reports/stability_analysis_plot.png')
     except Exception as e:
         _viz_logger.error(f"Error generating stability analysis plot: {e}")
@@ -1,5 +1,6 @@
+from types import MappingProxyType
+
 from stability_analysis import (
-    determine_stope_type,
     calculate_stope_dimensions,
     assess_stability,
     generate_enhanced_stope_visualizations,
@@ -10,39 +11,82 @@ REQUIRED_FIELDS = [
     'dip_angle', 'ore_thickness', 'rqd', 'mining_depth'
 ]
 
-def validate_inputs(inputs):
-    """Enhanced input validation with realistic mining parameters"""
-    # Redundant function: input validation is handled by input_validation.py
-    # This function should be removed. Inputs are assumed validated externally.
-    pass
+# Typical geometry and limits of each mining method, shared read-only by
+# get_stope_type_characteristics instead of being rebuilt on every call
+_STOPE_CHARACTERISTICS = MappingProxyType({
+    "Sublevel Stoping": MappingProxyType({
+        "typical_width": (15, 25),
+        "typical_length": (40, 80), 
+        "typical_height": (20, 60),
+        "min_dip": 45,
+        "min_rqd": 75,
+        "description": "Large-scale method with sublevel development"
+    }),
+    "Room-and-Pillar": MappingProxyType({
+        "typical_width": (6, 12),
+        "typical_length": (20, 50),
+        "typical_height": (3, 8),
+        "max_dip": 30,
+        "min_rqd": 50,
+        "description": "Systematic extraction with support pillars"
+    }),
+    "Cut-and-Fill": MappingProxyType({
+        "typical_width": (8, 15),
+        "typical_length": (30, 60),
+        "typical_height": (4, 12),
+        "min_dip": 30,
+        "min_rqd": 60,
+        "description": "Sequential cutting and backfilling"
+    }),
+    "Shrinkage Stoping": MappingProxyType({
+        "typical_width": (4, 8),
+        "typical_length": (20, 40),
+        "typical_height": (15, 50),
+        "min_dip": 50,
+        "min_rqd": 40,
+        "description": "Ore storage method for steep deposits"
+    }),
+    "Vertical Crater Retreat": MappingProxyType({
+        "typical_width": (20, 35),
+        "typical_length": (50, 100),
+        "typical_height": (30, 80),
+        "min_dip": 60,
+        "min_rqd": 80,
+        "description": "Large-hole blasting method"
+    })
+})
+_EMPTY_CHARACTERISTICS = MappingProxyType({})
+
+def calculate_stope_design(inputs, visualize=True):
+    """
+    Enhanced stope design calculation with realistic parameters.
 
-def calculate_stope_design(inputs):
-    """Enhanced stope design calculation with realistic parameters"""
+    With visualize=True the stope visualizations and cost charts are in
+    reports/ when this returns. visualize=False skips them, for sweeps that
+    only need the numbers.
+    """
     # Inputs are assumed validated by input_validation.py
-    # Determine stope type first
-    stope_type = determine_stope_type(inputs)
-    inputs['stope_type'] = stope_type
-    
-    # Calculate dimensions (no safety_factor input)
+    # Calculate dimensions (no safety_factor input); the stope type is
+    # classified once there and carried on the dimensions
     dimensions = calculate_stope_dimensions(inputs)
+    stope_type = dimensions['stope_type']
+    inputs['stope_type'] = stope_type
     
     # Assess stability (safety_factor is calculated inside)
     stability = assess_stability(inputs, dimensions)
 
     # Calculate costs based on realistic parameters
-    costs = estimate_mining_costs(inputs, dimensions)
+    costs = estimate_mining_costs(inputs, dimensions, visualize=visualize)
 
     # Generate all enhanced visualizations for GUI and PDF
-    # Extract required values for visualization
-    safety_factor = stability['safety_factor']
-    vertical_stress = stability['vertical_stress']
-    horizontal_stress = stability['horizontal_stress']
-    adjusted_strength = stability['rock_strength']
-    generate_enhanced_stope_visualizations(dimensions, inputs, safety_factor, vertical_stress, horizontal_stress, adjusted_strength)
+    if visualize:
+        # Extract required values for visualization
+        safety_factor = stability['safety_factor']
+        vertical_stress = stability['vertical_stress']
+        horizontal_stress = stability['horizontal_stress']
+        adjusted_strength = stability['rock_strength']
+        generate_enhanced_stope_visualizations(dimensions, inputs, safety_factor, vertical_stress, horizontal_stress, adjusted_strength)
 
-    # Add stope type to dimensions for visualization
-    dimensions['stope_type'] = stope_type
-    
     return {
         'stope_type': stope_type,
         'dimensions': dimensions,
@@ -84,46 +128,4 @@ Stability Class: {stability.get('stability_class', 'Unknown')}"""
 
 def get_stope_type_characteristics(stope_type):
     """Get characteristics of different stope types for validation"""
-    characteristics = {
-        "Sublevel Stoping": {
-            "typical_width": (15, 25),
-            "typical_length": (40, 80), 
-            "typical_height": (20, 60),
-            "min_dip": 45,
-            "min_rqd": 75,
-            "description": "Large-scale method with sublevel development"
-        },
-        "Room-and-Pillar": {
-            "typical_width": (6, 12),
-            "typical_length": (20, 50),
-            "typical_height": (3, 8),
-            "max_dip": 30,
-            "min_rqd": 50,
-            "description": "Systematic extraction with support pillars"
-        },
-        "Cut-and-Fill": {
-            "typical_width": (8, 15),
-            "typical_length": (30, 60),
-            "typical_height": (4, 12),
-            "min_dip": 30,
-            "min_rqd": 60,
-            "description": "Sequential cutting and backfilling"
-        },
-        "Shrinkage Stoping": {
-            "typical_width": (4, 8),
-            "typical_length": (20, 40),
-            "typical_height": (15, 50),
-            "min_dip": 50,
-            "min_rqd": 40,
-            "description": "Ore storage method for steep deposits"
-        },
-        "Vertical Crater Retreat": {
-            "typical_width": (20, 35),
-            "typical_length": (50, 100),
-            "typical_height": (30, 80),
-            "min_dip": 60,
-            "min_rqd": 80,
-            "description": "Large-hole blasting method"
-        }
-    }
-    return characteristics.get(stope_type, {})
+    return _STOPE_CHARACTERISTICS.get(stope_type, _EMPTY_CHARACTERISTICS)
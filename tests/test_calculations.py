@@ -0,0 +1,311 @@
+import math
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import stability_analysis as sa
+from _core_math import _dimension_core, _hoek_brown_core, _k_ratio_core, _stability_core, _stability_number_core
+from input_validation import validate_inputs
+from stope_calculations import calculate_stope_design
+
+# ============================================================================
+# REFERENCE FORMULAE
+# ============================================================================
+# The original scalar formulae, before the lookup tables and _core_math kernels
+
+def _ref_stability_number(q_val, dip, depth):
+    a = 1.0 if depth > 500 else 0.85
+    b = max(0.3, min(0.7, 0.3 + (dip-20)/70))
+    c = 1 - math.cos(math.radians(dip))
+    return q_val * a * b * c
+
+def _ref_hydraulic_radius(n_prime):
+    if n_prime<=3:    return 2.5 + 0.5*n_prime
+    if n_prime<=10:   return 4.0 + 0.8*n_prime
+    return 7.0 + 5.0*math.log10(n_prime)
+
+def _ref_k_ratio(depth):
+    if depth<300:
+        k=1.5
+    else:
+        k=0.65 + 1350/(depth+200)
+    return min(2.0, max(0.5, k))
+
+def _ref_hoek_brown(rqd):
+    sigma_ci = 20 + 0.8*rqd
+    gsi      = max(20, min(85, rqd-15))
+    s        = math.exp((gsi-100)/9)
+    a        = 0.5 + (1/6)*(math.exp(-gsi/15)-math.exp(-20/3))
+    return sigma_ci * (s**a)
+
+INTEGRAL_DIPS   = list(range(0, 91, 5)) + [89, 90]
+FRACTIONAL_DIPS = [12.5, 29.99, 37.25, 45.5, 60.01, 62.7, 89.9]
+INTEGRAL_RQDS   = list(range(0, 101, 5)) + [34, 99]
+FRACTIONAL_RQDS = [0.5, 33.3, 47.5, 80.25, 99.9]
+DEPTHS          = [50, 299.5, 300, 450, 500, 501, 900, 1500]
+
+# ============================================================================
+# _core_math AGAINST THE REFERENCE FORMULAE
+# ============================================================================
+
+@pytest.mark.parametrize("dip", INTEGRAL_DIPS + FRACTIONAL_DIPS)
+def test_dimension_core_matches_reference(dip):
+    for q_val in (0.05, 1.0, 22.5, 400.0):
+        for depth in (300, 501):
+            rmr, n_prime, hr_design = _dimension_core(q_val, dip, depth)
+            assert rmr == max(0, min(100, 9 * math.log10(q_val) + 44))
+            assert n_prime == _ref_stability_number(q_val, dip, depth)
+            assert hr_design == _ref_hydraulic_radius(n_prime)
+
+@pytest.mark.parametrize("rqd", INTEGRAL_RQDS + FRACTIONAL_RQDS)
+def test_stability_core_matches_reference(rqd):
+    # Integral RQD gives integral GSI, fractional RQD does not
+    for depth in DEPTHS:
+        for ore_t in (0.5, 5):
+            sig_v, k_ratio, sig_h, rock_s = _stability_core(depth, rqd, ore_t, sa.IBE_STRESS_FACTOR)
+            assert sig_v == depth * sa.IBE_STRESS_FACTOR
+            assert k_ratio == _ref_k_ratio(depth)
+            assert sig_h == sig_v * k_ratio
+            assert rock_s == _ref_hoek_brown(rqd) * (1 + 0.015*math.log(ore_t+1))
+
+@pytest.mark.parametrize("rqd", INTEGRAL_RQDS + FRACTIONAL_RQDS)
+def test_hoek_brown_core_matches_reference(rqd):
+    assert _hoek_brown_core(rqd) == _ref_hoek_brown(rqd)
+    assert sa.calculate_hoek_brown_strength_standard(rqd) == _ref_hoek_brown(rqd)
+
+@pytest.mark.parametrize("dip", INTEGRAL_DIPS + FRACTIONAL_DIPS)
+@pytest.mark.parametrize("depth", [300, 501])
+def test_stability_number_core_matches_reference(dip, depth):
+    # Integral dips take the B and C tables, fractional ones are computed
+    for q_val in (0.5, 3.0, 22.5):
+        assert _stability_number_core(q_val, dip, depth) == _ref_stability_number(q_val, dip, depth)
+
+def test_compiled_core_matches_python():
+    pytest.importorskip('numba')
+    for q_val in (0.05, 1.0, 22.5, 400.0):
+        for dip in INTEGRAL_DIPS + FRACTIONAL_DIPS:
+            for depth in (300, 501):
+                assert _dimension_core(q_val, dip, depth) == _dimension_core.py_func(q_val, dip, depth)
+    for rqd in INTEGRAL_RQDS + FRACTIONAL_RQDS:
+        for depth in DEPTHS:
+            assert (_stability_core(depth, rqd, 5, sa.IBE_STRESS_FACTOR)
+                    == _stability_core.py_func(depth, rqd, 5, sa.IBE_STRESS_FACTOR))
+
+def test_stope_dimensions_reject_a_zero_q_value():
+    inputs = {'rqd': 0, 'dip_angle': 65, 'mining_depth': 400, 'q_joint_set_number': 4,
+              'q_joint_roughness': 2, 'q_joint_alteration': 1, 'q_water_factor': 1,
+              'q_stress_reduction': 1}
+    with pytest.raises(ValueError, match="Q value must be positive"):
+        sa.calculate_stope_dimensions(inputs)
+
+# ============================================================================
+# BATCH FUNCTIONS AGAINST THE SCALAR ONES
+# ============================================================================
+
+def test_k_ratio_batch_matches_scalar():
+    expected = [sa.calculate_horizontal_k_ratio_standard(d) for d in DEPTHS]
+    np.testing.assert_allclose(sa._k_ratio_batch(np.array(DEPTHS, dtype=float)), expected, rtol=1e-12)
+
+def test_hoek_brown_batch_matches_scalar():
+    rqds = INTEGRAL_RQDS + FRACTIONAL_RQDS
+    expected = [sa.calculate_hoek_brown_strength_standard(r) for r in rqds]
+    np.testing.assert_allclose(sa._hoek_brown_batch(np.array(rqds, dtype=float)), expected, rtol=1e-12)
+
+def test_assess_stability_batch_matches_scalar(monkeypatch):
+    # Only the numbers are compared; nothing is drawn
+    monkeypatch.setattr(sa, 'generate_enhanced_stope_visualizations', lambda *args, **kwargs: None)
+    rqd, depth, ore_t = np.meshgrid(INTEGRAL_RQDS + FRACTIONAL_RQDS, DEPTHS, [0.5, 5], indexing='ij')
+    batch = sa.assess_stability_batch(rqd, depth, ore_t)
+    for index in np.ndindex(rqd.shape):
+        inputs = {'rqd': rqd[index], 'mining_depth': depth[index], 'ore_thickness': ore_t[index]}
+        scalar = sa.assess_stability(inputs, {})
+        for field in ('safety_factor', 'vertical_stress', 'horizontal_stress', 'k_ratio', 'rock_strength'):
+            assert batch[field][index] == pytest.approx(scalar[field], abs=0.01), field
+        assert batch['stability_class'][index] == scalar['stability_class']
+        assert batch['dgms_compliant'][index] == scalar['dgms_compliant']
+
+def test_hydraulic_radius_of_an_array_matches_scalar():
+    n_primes = [0.2, 3.0, 3.5, 10.0, 10.5, 250.0]
+    expected = [sa.calculate_hydraulic_radius_design(n) for n in n_primes]
+    np.testing.assert_allclose(sa.calculate_hydraulic_radius_design(np.array(n_primes)), expected, rtol=1e-12)
+
+@pytest.mark.parametrize("depth", DEPTHS)
+def test_k_ratio_core_matches_reference(depth):
+    assert _k_ratio_core(depth) == _ref_k_ratio(depth)
+    assert sa.calculate_horizontal_k_ratio_standard(depth) == _ref_k_ratio(depth)
+
+def test_determine_stope_type_batch_matches_scalar():
+    dip, rqd, depth = np.meshgrid(INTEGRAL_DIPS + FRACTIONAL_DIPS, INTEGRAL_RQDS + FRACTIONAL_RQDS,
+                                  [100, 799, 800, 1200], indexing='ij')
+    types = sa.determine_stope_type_batch(dip, rqd, depth)
+    for index in np.ndindex(dip.shape):
+        inputs = {'dip_angle': dip[index], 'rqd': rqd[index], 'mining_depth': depth[index]}
+        assert types[index] == sa.determine_stope_type(inputs)
+
+# ============================================================================
+# VISUALIZATIONS OF A DESIGN RUN
+# ============================================================================
+
+DESIGN = {
+    'ore_thickness': 5, 'dip_angle': 65, 'rqd': 80, 'mining_depth': 400,
+    'q_joint_set_number': 4, 'q_joint_roughness': 2, 'q_joint_alteration': 1,
+    'q_water_factor': 1, 'q_stress_reduction': 1, 'ore_type': 'gold',
+}
+
+def _design(**changes):
+    validation = validate_inputs({**DESIGN, **changes})
+    assert validation['valid'], validation
+    return calculate_stope_design(validation['data'])
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _published():
+    return {filename: _read(os.path.join('reports', filename)) for filename in sa._VIZ_FILES}
+
+@pytest.fixture(scope='module')
+def reports_cwd(tmp_path_factory):
+    # One directory for the module: the view pool keeps the working
+    # directory it was started in
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('design'))
+    yield
+    os.chdir(cwd)
+
+def test_design_run_publishes_all_visualizations(reports_cwd):
+    _design()
+    # Published before calculate_stope_design returns, not only after waiting
+    for filename in sa._VIZ_FILES:
+        assert os.path.getsize(os.path.join('reports', filename)) > 0
+    sa.wait_for_visualizations()
+    for filename in sa._VIZ_FILES:
+        assert os.path.getsize(os.path.join('reports', filename)) > 0
+    assert not [f for f in os.listdir('reports') if f.endswith('.tmp')]
+
+def test_returning_to_a_design_republishes_it(reports_cwd):
+    _design()
+    first = _published()
+    _design(dip_angle=20, rqd=60, mining_depth=300)
+    second = _published()
+    assert all(second[f] != first[f] for f in ('stope_3d_isometric.png', 'safety_factor_gauge.png'))
+    _design()
+    assert _published() == first
+    assert not sa._QUEUED_VIZ
+
+def test_concurrent_runs_of_a_design_render_it_once(reports_cwd, monkeypatch):
+    # Cache directories entered before anything was rendered into them
+    renders = []
+    render_to_cache = sa._render_to_cache
+    def counting_render_to_cache(cache_dir, *args):
+        if not os.path.exists(os.path.join(cache_dir, sa._VIZ_FILES[0])):
+            renders.append(cache_dir)
+        render_to_cache(cache_dir, *args)
+    monkeypatch.setattr(sa, '_render_to_cache', counting_render_to_cache)
+    errors = []
+    def run():
+        try:
+            _design(rqd=70, mining_depth=650)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(renders) == 1
+    assert not sa._QUEUED_VIZ
+
+def _newest_cache_dir():
+    return max(os.scandir(sa.VIZ_CACHE_DIR), key=lambda entry: entry.stat().st_mtime_ns).path
+
+def test_visualization_cache_keeps_the_most_recently_used_designs(reports_cwd, monkeypatch):
+    monkeypatch.setattr(sa, 'VIZ_CACHE_MAX_DESIGNS', 2)
+    _design(rqd=55)
+    first = _newest_cache_dir()
+    _design(rqd=65)
+    # Reusing the first design makes it the most recently used...
+    _design(rqd=55)
+    _design(rqd=75)
+    third = _newest_cache_dir()
+    # ...so the second is the one evicted
+    assert sorted(entry.path for entry in os.scandir(sa.VIZ_CACHE_DIR)) == sorted([first, third])
+    sa.prune_visualization_cache(keep=0)
+    assert not os.listdir(sa.VIZ_CACHE_DIR)
+    # The published views are left in place
+    for filename in sa._VIZ_FILES:
+        assert os.path.getsize(os.path.join('reports', filename)) > 0
+
+def test_3d_backend_is_part_of_the_cache_key(reports_cwd, monkeypatch):
+    _design(rqd=85)
+    matplotlib_dir = _newest_cache_dir()
+    monkeypatch.setattr(sa, 'STABILITY_3D_BACKEND', 'vispy')
+    _design(rqd=85)
+    assert _newest_cache_dir() != matplotlib_dir
+
+def test_dpi_crop_is_part_of_the_cache_key(reports_cwd, monkeypatch):
+    _design(rqd=85)
+    full_dpi_dir = _newest_cache_dir()
+    monkeypatch.setattr(sa, 'STABILITY_DPI_CROP', 2.0)
+    _design(rqd=85)
+    assert _newest_cache_dir() != full_dpi_dir
+
+@pytest.mark.parametrize("value, crop", [('2', 2.0), ('0.5', 1.0), ('half', 1.0), ('inf', 1.0), ('', 1.0)])
+def test_dpi_crop_from_env(monkeypatch, value, crop):
+    monkeypatch.setenv('STABILITY_DPI_CROP', value)
+    assert sa._dpi_crop_from_env() == crop
+
+def test_republishing_linked_views_leaves_no_temp_files(reports_cwd):
+    _design()
+    # Without its sidecar the design is published again from the cache,
+    # over the hardlinks already in reports/
+    os.remove(os.path.join('reports', '.hashes', 'stope_visualizations.txt'))
+    _design()
+    assert not [f for f in os.listdir('reports') if f.endswith('.tmp')]
+
+def test_publishing_invalidates_overwritten_sidecars(reports_cwd):
+    gauge = os.path.join('reports', 'safety_factor_gauge.png')
+    sa.generate_safety_factor_gauge(3.5)
+    direct = _read(gauge)
+    # The design publishes its own gauge over the direct one...
+    _design(mining_depth=600)
+    assert _read(gauge) != direct
+    # ...so a direct render of the old value must draw again
+    sa.generate_safety_factor_gauge(3.5)
+    assert _read(gauge) == direct
+    # and the design, overwritten in turn, is published again
+    _design(mining_depth=600)
+    assert _read(gauge) != direct
+
+def test_view_pool_does_not_fork_and_restarts_after_shutdown(reports_cwd):
+    executor = sa._viz_executor()
+    assert executor._mp_context.get_start_method() in ('forkserver', 'spawn')
+    sa._shutdown_viz_executor()
+    assert sa._VIZ_EXECUTOR is None
+    restarted = sa._viz_executor()
+    assert restarted is not executor
+    assert restarted.submit(sa.calculate_horizontal_k_ratio_standard, 450).result() == _ref_k_ratio(450)
+
+def test_figure_temp_names_differ_between_threads(tmp_path, monkeypatch):
+    replaced = []
+    replace = os.replace
+    def recording_replace(src, dst):
+        replaced.append(src)
+        replace(src, dst)
+    monkeypatch.setattr(sa.os, 'replace', recording_replace)
+    # Both threads alive at once, so their idents differ
+    started = threading.Barrier(2)
+    def save():
+        started.wait()
+        fig = sa._new_figure((2, 2))
+        sa._write_figure(fig, str(tmp_path / 'figure.png'), {'dpi': 50})
+    threads = [threading.Thread(target=save) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(replaced)) == 2
+    assert not [f for f in os.listdir(tmp_path) if f.endswith('.tmp')]
@@ -0,0 +1,55 @@
+import importlib.util
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+from ml_models import evaluate_model, predict_failure, train_failure_prediction_model
+
+def _mine_data(rows=300, seed=0, noise=0.0):
+    """Synthetic stope records that fail at low RQD or great depth"""
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        'rqd': rng.uniform(20, 100, rows),
+        'mining_depth': rng.uniform(100, 1200, rows),
+        'dip_angle': rng.uniform(10, 90, rows),
+    })
+    failure = (data['rqd'] < 50) | (data['mining_depth'] > 1000)
+    # Flip a share of the labels so evaluation metrics are not all 1.0
+    flipped = rng.uniform(size=rows) < noise
+    data['failure'] = (failure ^ flipped).astype(int)
+    return data
+
+def test_sklearn_backend_trains_and_predicts(tmp_path):
+    model_path = str(tmp_path / 'model.pkl')
+    train_failure_prediction_model(_mine_data(), model_path)
+    assert predict_failure([30.0, 400.0, 60.0], model_path) == 1
+    assert predict_failure([90.0, 400.0, 60.0], model_path) == 0
+
+def test_cuml_backend_without_cuml_saves_no_model(tmp_path, capsys):
+    if importlib.util.find_spec('cuml') is not None:
+        pytest.skip("cuML is installed")
+    model_path = str(tmp_path / 'model.pkl')
+    train_failure_prediction_model(_mine_data(), model_path, backend='cuml')
+    assert "Error training model" in capsys.readouterr().out
+    assert not os.path.exists(model_path)
+
+def test_evaluate_model_metrics_match_sklearn(tmp_path, capsys):
+    model_path = str(tmp_path / 'model.pkl')
+    train_failure_prediction_model(_mine_data(), model_path)
+    data = _mine_data(seed=1, noise=0.2)
+    capsys.readouterr()
+    evaluate_model(data, model_path)
+    report = capsys.readouterr().out.splitlines()
+
+    y_true = data['failure']
+    y_pred = joblib.load(model_path).predict(data.drop(columns=['failure']))
+    labels = np.union1d(y_true, y_pred)
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=labels, zero_division=0)
+    assert f"Overall Model Accuracy: {accuracy_score(y_true, y_pred):.3f}" in report
+    for label, p, r, f, n in zip(labels, precision, recall, f1, support):
+        assert f"{label!s:>12}{p:>10.2f}{r:>10.2f}{f:>10.2f}{n:>10}" in report
@@ -0,0 +1,129 @@
+import os
+import re
+
+import pytest
+from fpdf import FPDF
+from PIL import Image
+
+import report_generator
+
+RESULTS = {
+    'stope_type': 'Sublevel Stoping',
+    'dimensions': {
+        'length': 154.2, 'width': 15.42, 'height': 12.34, 'volume': 29341.61,
+        'hydraulic_radius': 3.43, 'rmr': 56.17, 'q_value': 22.5, 'stability_number': 5.71,
+    },
+    'stability': {
+        'safety_factor': 1.62, 'stability_class': 'Marginal', 'vertical_stress': 8.4,
+        'horizontal_stress': 16.8, 'rock_strength': 13.61, 'dgms_compliant': True,
+    },
+    'costs': {
+        'total': 1000000.0, 'labor': 600000.0, 'equipment': 250000.0,
+        'support': 100000.0, 'ventilation': 50000.0,
+    },
+}
+
+@pytest.fixture
+def no_fallback(monkeypatch):
+    """Filenames passed to the fallback report; empty when the full layout succeeded"""
+    fallbacks = []
+    monkeypatch.setattr(report_generator, '_create_fallback_pdf_report',
+                        lambda results, filename: fallbacks.append(filename))
+    return fallbacks
+
+def test_pdf_report_is_written(tmp_path, monkeypatch, no_fallback):
+    monkeypatch.chdir(tmp_path)
+    filename = os.path.join('out', 'stope_report.pdf')
+    assert report_generator.generate_pdf_report(RESULTS, filename, 'Test notes') == filename
+    assert not no_fallback
+    with open(filename, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+def test_str_width_matches_fpdf():
+    pdf = FPDF()
+    pdf.set_font('Helvetica', 'B', 12)
+    for text in ('', 'Safety Factor', 'EXECUTIVE SUMMARY'):
+        assert report_generator._str_width('Helvetica', 'B', 12, text) == pdf.get_string_width(text)
+
+def test_summary_text_lists_design_and_costs(tmp_path):
+    filename = str(tmp_path / 'stope_summary.txt')
+    assert report_generator.generate_summary_text(RESULTS, filename, 'Test notes') == filename
+    with open(filename, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    for expected in ("Mining Method: Sublevel Stoping", "Width: 15.42 meters",
+                     "Safety Factor: 1.62 [✓ COMPLIANT]", "Stability Class: Marginal",
+                     "Total Project Cost: ₹1,000,000.00", "  • Labor Costs: ₹600,000.00",
+                     "  • Labor: 60.0%", "Test notes"):
+        assert expected in lines
+
+def _write_png(path, size):
+    Image.new('RGBA', size, (30, 120, 200, 255)).save(path)
+    # Older than anything written during the test
+    os.utime(path, (1_000_000_000, 1_000_000_000))
+
+def test_optimized_visualization_is_a_reused_palette_copy(tmp_path):
+    source = str(tmp_path / 'view.png')
+    _write_png(source, (400, 300))
+    optimized = report_generator._optimize_visualization(source)
+    assert optimized == str(tmp_path / 'view_opt.png')
+    with Image.open(optimized) as im:
+        assert im.mode == 'P'
+        assert im.size == (400, 300)
+    # Kept until the source changes
+    mtime = os.stat(optimized).st_mtime_ns
+    assert report_generator._optimize_visualization(source) == optimized
+    assert os.stat(optimized).st_mtime_ns == mtime
+
+def test_all_reports_are_generated_together(tmp_path, monkeypatch, no_fallback):
+    monkeypatch.chdir(tmp_path)
+    summary, pdf = report_generator.generate_all_reports(
+        RESULTS, os.path.join('out', 'stope_summary.txt'), os.path.join('out', 'stope_report.pdf'))
+    assert (summary, pdf) == (os.path.join('out', 'stope_summary.txt'), os.path.join('out', 'stope_report.pdf'))
+    assert os.path.getsize(summary) > 0
+    with open(pdf, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+def test_wide_visualization_is_downsampled_to_the_embed_width(tmp_path):
+    source = str(tmp_path / 'view.png')
+    _write_png(source, (2 * report_generator._EMBED_MAX_WIDTH_PX, 1000))
+    with Image.open(report_generator._optimize_visualization(source)) as im:
+        assert im.size == (report_generator._EMBED_MAX_WIDTH_PX, 500)
+
+def test_cost_breakdown_percentages():
+    assert report_generator._cost_breakdown(RESULTS['costs'], 1000000.0) == [
+        ('Labor', 600000.0, 60.0),
+        ('Equipment', 250000.0, 25.0),
+        ('Support', 100000.0, 10.0),
+        ('Ventilation', 50000.0, 5.0),
+    ]
+    # Missing components are skipped; a zero total gives zero shares
+    assert report_generator._cost_breakdown({'labor': 5.0}, 0) == [('Labor', 5.0, 0)]
+
+def test_table_rows_are_dot_leadered_to_one_width():
+    table = report_generator._format_table([('Length', '154.2 m'), ('Stability Class', 'Marginal')])
+    width = report_generator._TABLE_LABEL_WIDTH + report_generator._TABLE_VALUE_WIDTH
+    lines = table.split('\n')
+    assert [len(line) for line in lines] == [width, width]
+    assert lines[0].startswith('Length.') and lines[0].endswith('.154.2 m')
+    assert lines[1].startswith('Stability Class.') and lines[1].endswith('.Marginal')
+
+def test_pdf_table_rows_are_aligned_text_runs(tmp_path, monkeypatch, no_fallback):
+    new_report_pdf = report_generator._new_report_pdf
+    def uncompressed_pdf():
+        pdf = new_report_pdf()
+        pdf.set_compression(False)
+        return pdf
+    monkeypatch.setattr(report_generator, '_new_report_pdf', uncompressed_pdf)
+    monkeypatch.chdir(tmp_path)
+    report_generator.generate_pdf_report(RESULTS, os.path.join('out', 'stope_report.pdf'))
+    assert not no_fallback
+    with open(os.path.join('out', 'stope_report.pdf'), 'rb') as f:
+        content = f.read().decode('latin-1')
+    # Each row is one text run, e.g. "BT 59.53 260.62 Td ... (Safety Factor....1.62 \(COMPLIANT\)) Tj"
+    width = report_generator._TABLE_LABEL_WIDTH + report_generator._TABLE_VALUE_WIDTH
+    row_x = set()
+    for label in ('Length', 'Safety Factor', 'Stability Class'):
+        match = re.search(r'BT ([\d.]+) [\d.]+ Td [^(]*\((' + label + r'\.(?:\\.|[^\\)])*)\) Tj', content)
+        assert len(re.sub(r'\\(.)', r'\1', match.group(2))) == width, label
+        row_x.add(match.group(1))
+    assert len(row_x) == 1, row_x